@@ -1,36 +1,58 @@
 from crewai import Agent
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
-from tools import search_tool, scrape_tool
-from config import GOOGLE_API_KEY, OPENAI_API_KEY
+from tools import create_tools
+from venue_search import VenueSearchTool, create_venue_search_tool
+from config import (
+    GOOGLE_API_KEY,
+    OPENAI_API_KEY,
+    AGENT_MAX_ITER,
+    AGENT_MAX_EXECUTION_TIME,
+    VENUE_FANOUT_ENABLED,
+    VERBOSE,
+    load_llm_tier_config,
+)
+from http_client import get_httpx_client
+from budget import TokenUsageCallbackHandler
+from llm_tiers import TieredChatModel
 import logging
 
 logger = logging.getLogger(__name__)
 
-def get_llm():
-    """Get the best available LLM with proper error handling"""
+# Validated model tiers and per-agent phase configuration
+llm_tier_config = load_llm_tier_config()
+
+def get_llm(agent_role="default", tier="fast"):
+    """Get the best available LLM for a model tier with proper error handling"""
+    models = llm_tier_config["tiers"].get(tier, llm_tier_config["tiers"]["fast"])
+
     try:
-        if GOOGLE_API_KEY:
-            logger.info("Using Google Gemini LLM")
+        if GOOGLE_API_KEY and models.get("google"):
+            logger.info(f"Using Google Gemini LLM ({models['google']}, {tier} tier) for {agent_role}")
+            # Gemini talks gRPC over a single long-lived HTTP/2 channel, so it
+            # already reuses connections and does not take an httpx client
             return ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash-exp",
+                model=models["google"],
                 google_api_key=GOOGLE_API_KEY,
                 temperature=0.7,
                 max_retries=3,
-                request_timeout=120  # Increased timeout
+                request_timeout=120,  # Increased timeout
+                callbacks=[TokenUsageCallbackHandler(agent_role, models["google"], tier)]
             )
     except Exception as e:
         logger.warning(f"Error with Gemini LLM: {e}")
     
     try:
-        if OPENAI_API_KEY:
-            logger.info("Using OpenAI LLM as fallback")
+        if OPENAI_API_KEY and models.get("openai"):
+            logger.info(f"Using OpenAI LLM ({models['openai']}, {tier} tier) for {agent_role}")
             return ChatOpenAI(
-                model="gpt-3.5-turbo",
+                model=models["openai"],
                 openai_api_key=OPENAI_API_KEY,
                 temperature=0.7,
                 max_retries=3,
-                request_timeout=120
+                request_timeout=120,
+                http_client=get_httpx_client(),  # Shared keep-alive connection pool
+                callbacks=[TokenUsageCallbackHandler(agent_role, models["openai"], tier)]
             )
     except Exception as e:
         logger.warning(f"Error with OpenAI LLM: {e}")
@@ -38,11 +60,29 @@ def get_llm():
     logger.warning("No LLM configured, using default")
     return None
 
-# Get the LLM instance
-llm = get_llm()
+def get_agent_llm(agent_role):
+    """Get the LLM for an agent, tiering tool-selection steps and the final answer"""
+    agents_config = llm_tier_config["agents"]
+    phases = agents_config.get(agent_role, agents_config["default"])
+
+    tool_llm = get_llm(agent_role, phases["tool_phase"])
+    if phases["final_phase"] == phases["tool_phase"]:
+        return tool_llm
+
+    final_llm = get_llm(agent_role, phases["final_phase"])
+    if tool_llm is None or final_llm is None:
+        return tool_llm or final_llm
+    return TieredChatModel(fast_llm=tool_llm, strong_llm=final_llm, agent_role=agent_role)
 
-def create_venue_coordinator():
+def create_venue_coordinator(tools=None):
     """Create venue coordinator agent"""
+    tools = create_tools() if tools is None else list(tools)
+    # The fan-out search is added to explicitly passed tools too, unless already there
+    if VENUE_FANOUT_ENABLED and not any(isinstance(tool, VenueSearchTool) for tool in tools):
+        venue_search_tool = create_venue_search_tool()
+        if venue_search_tool:
+            tools.insert(0, venue_search_tool)
+    
     agent_kwargs = {
         "role": "Venue Coordinator",
         "goal": (
@@ -50,10 +90,10 @@ def create_venue_coordinator():
             "including capacity, budget, location, and special needs. Focus on finding "
             "ONE specific venue with complete details and contact information."
         ),
-        "tools": [search_tool, scrape_tool],
-        "verbose": True,
-        "max_iter": 5,
-        "max_execution_time": 600,  # 10 minute timeout
+        "tools": tools,
+        "verbose": VERBOSE,
+        "max_iter": AGENT_MAX_ITER,  # Default; the run scheduler adjusts this per run
+        "max_execution_time": AGENT_MAX_EXECUTION_TIME,  # 10 minute default timeout
         "backstory": (
             "With a keen sense of space and understanding of event logistics, "
             "you excel at finding and securing the perfect venue that fits the event's theme, "
@@ -63,12 +103,13 @@ def create_venue_coordinator():
         )
     }
     
+    llm = get_agent_llm(agent_kwargs["role"])
     if llm:
         agent_kwargs["llm"] = llm
     
     return Agent(**agent_kwargs)
 
-def create_logistics_manager():
+def create_logistics_manager(tools=None):
     """Create logistics manager agent"""
     agent_kwargs = {
         "role": "Logistics Manager",
@@ -77,10 +118,10 @@ def create_logistics_manager():
             "and coordination based on specific requirements, budget, and timeline. "
             "Provide detailed vendor recommendations with specific contact information."
         ),
-        "tools": [search_tool, scrape_tool],
-        "verbose": True,
-        "max_iter": 5,
-        "max_execution_time": 600,
+        "tools": tools if tools is not None else create_tools(),
+        "verbose": VERBOSE,
+        "max_iter": AGENT_MAX_ITER,
+        "max_execution_time": AGENT_MAX_EXECUTION_TIME,
         "backstory": (
             "Organized and detail-oriented, you ensure that every logistical aspect "
             "of the event from catering to equipment setup is flawlessly executed to "
@@ -90,12 +131,13 @@ def create_logistics_manager():
         )
     }
     
+    llm = get_agent_llm(agent_kwargs["role"])
     if llm:
         agent_kwargs["llm"] = llm
     
     return Agent(**agent_kwargs)
 
-def create_marketing_agent():
+def create_marketing_agent(tools=None):
     """Create marketing and communications agent"""
     agent_kwargs = {
         "role": "Marketing and Communications Agent",
@@ -104,10 +146,10 @@ def create_marketing_agent():
             "and engage target audiences within budget constraints and timeline requirements. "
             "Develop actionable marketing plans with specific tactics and measurable outcomes."
         ),
-        "tools": [search_tool, scrape_tool],
-        "verbose": True,
-        "max_iter": 5,
-        "max_execution_time": 600,
+        "tools": tools if tools is not None else create_tools(),
+        "verbose": VERBOSE,
+        "max_iter": AGENT_MAX_ITER,
+        "max_execution_time": AGENT_MAX_EXECUTION_TIME,
         "backstory": (
             "Creative and communicative, you craft compelling marketing campaigns and "
             "engage with potential attendees across multiple channels to maximize event "
@@ -117,12 +159,8 @@ def create_marketing_agent():
         )
     }
     
+    llm = get_agent_llm(agent_kwargs["role"])
     if llm:
         agent_kwargs["llm"] = llm
     
-    return Agent(**agent_kwargs)
-
-# Create agent instances
-venue_coordinator = create_venue_coordinator()
-logistics_manager = create_logistics_manager()
-marketing_communications_agent = create_marketing_agent()
\ No newline at end of file
+    return Agent(**agent_kwargs)
\ No newline at end of file
@@ -0,0 +1,239 @@
+from langchain_core.callbacks import BaseCallbackHandler
+from config import (
+    RUN_TOKEN_BUDGET,
+    AGENT_TOKEN_BUDGET,
+    RUN_COST_BUDGET_USD,
+    AGENT_COST_BUDGET_USD,
+)
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens as (input, output)
+MODEL_PRICING = {
+    "gemini-2.0-flash-exp": (0.10, 0.40),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# Models already reported as missing from MODEL_PRICING
+_warned_unpriced_models = set()
+_warned_unpriced_lock = threading.Lock()
+
+def _warn_unpriced(model):
+    with _warned_unpriced_lock:
+        if model in _warned_unpriced_models:
+            return
+        _warned_unpriced_models.add(model)
+    logger.warning(f"No pricing for model {model}; its calls count as $0 and cost budgets cannot limit them")
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """Estimate the USD cost of a call from the pricing table, or None for unpriced models"""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        _warn_unpriced(model)
+        return None
+    input_price, output_price = pricing
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+def extract_token_usage(response):
+    """Return (prompt_tokens, completion_tokens) from a LangChain LLMResult"""
+    llm_output = response.llm_output or {}
+    token_usage = llm_output.get("token_usage") or llm_output.get("usage") or {}
+    if token_usage:
+        return (
+            int(token_usage.get("prompt_tokens", 0) or 0),
+            int(token_usage.get("completion_tokens", 0) or 0)
+        )
+
+    # Chat models (including Gemini) report usage on each generated message
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            prompt_tokens += int(usage.get("input_tokens", 0) or 0)
+            completion_tokens += int(usage.get("output_tokens", 0) or 0)
+    return prompt_tokens, completion_tokens
+
+def _empty_usage():
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost_usd": 0.0}
+
+class RunBudget:
+    """Token and cost accounting for one crew run, with per-run and per-agent limits"""
+
+    def __init__(self, run_id, run_token_budget=RUN_TOKEN_BUDGET, agent_token_budget=AGENT_TOKEN_BUDGET,
+                 run_cost_budget=RUN_COST_BUDGET_USD, agent_cost_budget=AGENT_COST_BUDGET_USD):
+        self.run_id = run_id
+        self.run_token_budget = run_token_budget
+        self.agent_token_budget = agent_token_budget
+        self.run_cost_budget = run_cost_budget
+        self.agent_cost_budget = agent_cost_budget
+        self.totals = _empty_usage()
+        self.agents = {}
+        self.tiers = {}
+        self.exhausted_agents = set()
+        self.unpriced_models = set()
+        self._lock = threading.Lock()
+
+    def _over_limit(self, usage, token_budget, cost_budget):
+        if token_budget and usage["total_tokens"] >= token_budget:
+            return True
+        return bool(cost_budget and usage["cost_usd"] >= cost_budget)
+
+    def record(self, agent_role, model, prompt_tokens, completion_tokens, tier=None, latency=0.0):
+        """Add one LLM call to the totals; return True if the agent must stop"""
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            if cost is None:
+                self.unpriced_models.add(model)
+                cost = 0.0
+            agent_usage = self.agents.setdefault(agent_role, _empty_usage())
+            tier_usage = self.tiers.setdefault(tier or "default", {**_empty_usage(), "latency_seconds": 0.0, "models": []})
+            for usage in (self.totals, agent_usage, tier_usage):
+                usage["calls"] += 1
+                usage["prompt_tokens"] += prompt_tokens
+                usage["completion_tokens"] += completion_tokens
+                usage["total_tokens"] += prompt_tokens + completion_tokens
+                usage["cost_usd"] += cost
+            tier_usage["latency_seconds"] += latency
+            if model not in tier_usage["models"]:
+                tier_usage["models"].append(model)
+
+            exhausted = (
+                self._over_limit(self.totals, self.run_token_budget, self.run_cost_budget)
+                or self._over_limit(agent_usage, self.agent_token_budget, self.agent_cost_budget)
+            )
+            newly_exhausted = exhausted and agent_role not in self.exhausted_agents
+            if exhausted:
+                self.exhausted_agents.add(agent_role)
+
+        if newly_exhausted:
+            logger.warning(
+                f"Token budget exhausted for {agent_role} in run {self.run_id} "
+                f"(agent: {agent_usage['total_tokens']} tokens, run: {self.totals['total_tokens']} tokens)"
+            )
+        return exhausted
+
+    def is_exhausted(self, agent_role):
+        with self._lock:
+            return agent_role in self.exhausted_agents
+
+    def summary(self):
+        """Return the totals in a JSON-serialisable form for the run record"""
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "totals": {**self.totals, "cost_usd": round(self.totals["cost_usd"], 6)},
+                "agents": {
+                    role: {**usage, "cost_usd": round(usage["cost_usd"], 6)}
+                    for role, usage in self.agents.items()
+                },
+                "tiers": {
+                    tier: {
+                        **usage,
+                        "cost_usd": round(usage["cost_usd"], 6),
+                        "latency_seconds": round(usage["latency_seconds"], 3),
+                        "avg_latency_seconds": round(usage["latency_seconds"] / usage["calls"], 3) if usage["calls"] else 0.0,
+                        "avg_tokens_per_call": round(usage["total_tokens"] / usage["calls"], 1) if usage["calls"] else 0.0,
+                    }
+                    for tier, usage in self.tiers.items()
+                },
+                "limits": {
+                    "run_tokens": self.run_token_budget,
+                    "agent_tokens": self.agent_token_budget,
+                    "run_cost_usd": self.run_cost_budget,
+                    "agent_cost_usd": self.agent_cost_budget,
+                },
+                "exhausted_agents": sorted(self.exhausted_agents),
+                "unpriced_models": sorted(self.unpriced_models),
+            }
+
+def force_final_answer(agent):
+    """Make the agent's executor give its final answer on the next iteration
+
+    LangChain-based crewai executors ask for the final answer when they reach
+    force_answer_max_iterations; reaching max_iterations instead ends the run with
+    "Agent stopped due to iteration limit or time limit". Newer executors without
+    that path ask for the final answer when they reach max_iter.
+    """
+    executor = getattr(agent, "agent_executor", None)
+    if executor is None:
+        return
+    iterations = getattr(executor, "iterations", None)
+    if iterations is None:
+        return
+    if hasattr(executor, "force_answer_max_iterations"):
+        if getattr(executor, "have_forced_answer", False):
+            return
+        executor.force_answer_max_iterations = iterations + 1
+        # Leave room for the forced-answer step and the answer itself
+        limit = getattr(executor, "max_iterations", None)
+        if limit is not None and limit < iterations + 3:
+            executor.max_iterations = iterations + 3
+    else:
+        limit = getattr(executor, "max_iter", None)
+        if limit is not None and limit > iterations + 1:
+            executor.max_iter = iterations + 1
+    logger.info(f"Forcing final answer from {getattr(agent, 'role', 'agent')}")
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """LangChain callback that feeds every LLM call of one agent into the active RunBudget"""
+
+    def __init__(self, agent_role, model, tier=None):
+        super().__init__()
+        self.agent_role = agent_role
+        self.model = model
+        self.tier = tier
+        self.run_budget = None
+        self.agent = None
+        self._started = {}
+
+    def on_llm_start(self, serialized, prompts, run_id=None, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized, messages, run_id=None, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_error(self, error, run_id=None, **kwargs):
+        self._started.pop(run_id, None)
+
+    def on_llm_end(self, response, run_id=None, **kwargs):
+        started = self._started.pop(run_id, None)
+        run_budget = self.run_budget
+        if run_budget is None:
+            return
+        try:
+            latency = time.perf_counter() - started if started is not None else 0.0
+            prompt_tokens, completion_tokens = extract_token_usage(response)
+            exhausted = run_budget.record(
+                self.agent_role, self.model, prompt_tokens, completion_tokens,
+                tier=self.tier, latency=latency
+            )
+            if exhausted and self.agent:
+                force_final_answer(self.agent)
+        except Exception as e:
+            logger.warning(f"Token accounting error (non-critical): {e}")
+
+def usage_handlers(agent):
+    """Return the TokenUsageCallbackHandlers attached to an agent's LLM"""
+    llm = getattr(agent, "llm", None)
+    # Tiered models carry the handlers on their per-tier inner models
+    models = [llm, getattr(llm, "fast_llm", None), getattr(llm, "strong_llm", None)]
+    handlers = []
+    for model in models:
+        for handler in getattr(model, "callbacks", None) or []:
+            if isinstance(handler, TokenUsageCallbackHandler) and handler not in handlers:
+                handlers.append(handler)
+    return handlers
+
+def attach_run_budget(agents, run_budget):
+    """Route token usage of the given agents into run_budget (None detaches)"""
+    for agent in agents:
+        for handler in usage_handlers(agent):
+            handler.run_budget = run_budget
+            handler.agent = agent if run_budget is not None else None
@@ -1,5 +1,7 @@
 import os
 from dotenv import load_dotenv
+from log_pipeline import configure_logging, parse_sample_rates
+import json
 import logging
 import signal
 import sys
@@ -14,14 +16,85 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 
+# Search and scrape settings
+SEARCH_BATCH_MODE = os.getenv("SEARCH_BATCH_MODE", "true").lower() in ("1", "true", "yes")
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "5"))
+PREFETCH_TOP_K = int(os.getenv("PREFETCH_TOP_K", "2"))
+PREFETCH_MAX_WORKERS = int(os.getenv("PREFETCH_MAX_WORKERS", "4"))
+SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "900"))  # 15 minutes
+SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "256"))
+
+# Parallel venue search settings
+VENUE_FANOUT_ENABLED = os.getenv("VENUE_FANOUT_ENABLED", "true").lower() in ("1", "true", "yes")
+VENUE_FANOUT_MAX_WORKERS = int(os.getenv("VENUE_FANOUT_MAX_WORKERS", "6"))
+VENUE_SUBSEARCH_TIMEOUT = float(os.getenv("VENUE_SUBSEARCH_TIMEOUT", "15"))
+VENUE_CANDIDATES_RETURNED = int(os.getenv("VENUE_CANDIDATES_RETURNED", "5"))
+
+# Profiling settings (used with --profile)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.01"))
+
+# Shared HTTP connection pool settings
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", "300"))
+
+# Token and cost budgets (0 disables a limit)
+RUN_TOKEN_BUDGET = int(os.getenv("RUN_TOKEN_BUDGET", "400000"))
+AGENT_TOKEN_BUDGET = int(os.getenv("AGENT_TOKEN_BUDGET", "150000"))
+RUN_COST_BUDGET_USD = float(os.getenv("RUN_COST_BUDGET_USD", "0"))
+AGENT_COST_BUDGET_USD = float(os.getenv("AGENT_COST_BUDGET_USD", "0"))
+RUN_RECORD_FILE = os.getenv("RUN_RECORD_FILE", "run_record.json")
+OUTPUT_DIR = os.getenv("OUTPUT_DIR", "outputs")  # Each run writes its files to OUTPUT_DIR/<run_id>
+
+# Run deadline and per-agent time allocation
+RUN_DEADLINE_SECONDS = int(os.getenv("RUN_DEADLINE_SECONDS", "2400"))  # 40 minutes end to end
+AGENT_MAX_ITER = int(os.getenv("AGENT_MAX_ITER", "5"))
+AGENT_MIN_ITER = int(os.getenv("AGENT_MIN_ITER", "2"))
+AGENT_MAX_EXECUTION_TIME = int(os.getenv("AGENT_MAX_EXECUTION_TIME", "600"))
+MIN_TASK_SECONDS = int(os.getenv("MIN_TASK_SECONDS", "60"))
+SECONDS_PER_ITERATION = int(os.getenv("SECONDS_PER_ITERATION", "90"))
+
+# Model tiers: model name per provider for each tier
+DEFAULT_LLM_TIERS = {
+    "fast": {"google": "gemini-2.0-flash-exp", "openai": "gpt-3.5-turbo"},
+    "strong": {"google": "gemini-1.5-pro", "openai": "gpt-4o"},
+}
+# Tier used per agent role for tool-selection steps and for the final answer
+DEFAULT_AGENT_LLM_CONFIG = {
+    "default": {"tool_phase": "fast", "final_phase": "fast"},
+}
+LLM_PROVIDERS = ("google", "openai")
+LLM_PHASES = ("tool_phase", "final_phase")
+
+# Crew pool settings
+CREW_POOL_SIZE = int(os.getenv("CREW_POOL_SIZE", "2"))
+CREW_POOL_WARM = int(os.getenv("CREW_POOL_WARM", "1"))  # Crews built ahead of the first run
+CREW_CHECKOUT_TIMEOUT = int(os.getenv("CREW_CHECKOUT_TIMEOUT", "300"))
+
 # Thread management
 active_threads = []
 shutdown_event = threading.Event()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Logging settings
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+LOG_FILE = os.getenv("LOG_FILE")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "DEBUG=0.1")
+VERBOSE = os.getenv("VERBOSE", "false").lower() in ("1", "true", "yes")  # crewai reasoning dumps to stdout
+
+# Configure logging through the non-blocking queue pipeline
+configure_logging(
+    level=getattr(logging, LOG_LEVEL, logging.INFO),
+    log_format=LOG_FORMAT,
+    log_file=LOG_FILE,
+    queue_size=LOG_QUEUE_SIZE,
+    max_message_chars=LOG_MAX_MESSAGE_CHARS,
+    sample_rates=parse_sample_rates(LOG_SAMPLE_RATES)
 )
 logger = logging.getLogger(__name__)
 
@@ -43,6 +116,50 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 atexit.register(cleanup_threads)
 
+def _load_json_env(name, default):
+    """Load a JSON object from an environment variable, falling back to default"""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        value = json.loads(raw)
+        if isinstance(value, dict):
+            return value
+        logger.warning(f"{name} must be a JSON object, using defaults")
+    except json.JSONDecodeError as e:
+        logger.warning(f"Invalid JSON in {name} ({e}), using defaults")
+    return default
+
+def load_llm_tier_config():
+    """Load and validate LLM_TIERS and AGENT_LLM_CONFIG, dropping invalid entries"""
+    tiers = {}
+    for tier, models in _load_json_env("LLM_TIERS", DEFAULT_LLM_TIERS).items():
+        if not isinstance(models, dict) or not any(models.get(p) for p in LLM_PROVIDERS):
+            logger.warning(f"LLM tier '{tier}' needs a model for 'google' or 'openai', skipping")
+            continue
+        tiers[tier] = {p: models[p] for p in LLM_PROVIDERS if models.get(p)}
+    if "fast" not in tiers:
+        tiers["fast"] = DEFAULT_LLM_TIERS["fast"]
+
+    agents = {}
+    agent_config = {**DEFAULT_AGENT_LLM_CONFIG, **_load_json_env("AGENT_LLM_CONFIG", {})}
+    for role, phases in agent_config.items():
+        if not isinstance(phases, dict):
+            logger.warning(f"AGENT_LLM_CONFIG entry for '{role}' must be an object, skipping")
+            continue
+        validated = {}
+        for phase in LLM_PHASES:
+            tier = phases.get(phase, DEFAULT_AGENT_LLM_CONFIG["default"][phase])
+            if tier not in tiers:
+                logger.warning(f"Unknown LLM tier '{tier}' for {role} {phase}, using 'fast'")
+                tier = "fast"
+            validated[phase] = tier
+        agents[role] = validated
+    if "default" not in agents:
+        # Roles without an entry of their own fall back to this one
+        agents["default"] = dict(DEFAULT_AGENT_LLM_CONFIG["default"])
+    return {"tiers": tiers, "agents": agents}
+
 def validate_config():
     """Validate configuration with multiple API key options"""
     missing_vars = []
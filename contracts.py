@@ -0,0 +1,72 @@
+import ast
+import json
+import os
+
+# Output contracts matching each task's expected_output, keyed by output file
+TASK_CONTRACTS = {
+    "venue_details.json": {
+        "format": "json",
+        "fields": ["name", "address", "capacity", "booking_status", "price_range", "amenities", "contact_info"]
+    },
+    "logistics_plan.md": {
+        "format": "markdown",
+        "sections": ["catering", "equipment", "timeline", "cost"]
+    },
+    "marketing_strategy.md": {
+        "format": "markdown",
+        "sections": ["audience", "channel", "calendar", "kpi"]
+    }
+}
+
+def _parse_json_object(text):
+    """Parse the outermost {...} block in text, accepting single-quoted JSON"""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    candidate = text[start:end + 1]
+    for parser in (json.loads, ast.literal_eval):
+        try:
+            parsed = parser(candidate)
+            if isinstance(parsed, dict):
+                return parsed
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            # literal_eval raises TypeError for unhashable keys like {[1]: 2}
+            continue
+    return None
+
+def _markdown_headings(text):
+    """Return the lowercased text of '#' headings and lines that start with a bold label"""
+    headings = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            headings.append(line.lstrip("#").strip().lower())
+        elif line.startswith("**") and line.find("**", 2) > 2:
+            headings.append(line[2:line.find("**", 2)].strip().lower())
+    return headings
+
+def task_output_name(task):
+    """Return the task's output file name without its run directory"""
+    output_file = getattr(task, "output_file", None)
+    return os.path.basename(output_file) if output_file else None
+
+def output_satisfies_contract(task, text):
+    """Check whether text already meets the task's expected_output contract"""
+    contract = TASK_CONTRACTS.get(task_output_name(task))
+    if not contract or not text:
+        return False
+
+    if contract["format"] == "json":
+        parsed = _parse_json_object(text)
+        return parsed is not None and all(parsed.get(field) not in (None, "") for field in contract["fields"])
+
+    # Every section needs a heading of its own, not one line naming them all
+    sections = contract["sections"]
+    unused = _markdown_headings(text)
+    for section in sections:
+        candidates = [heading for heading in unused if section in heading]
+        if not candidates:
+            return False
+        # Use up the heading that covers the fewest other sections
+        unused.remove(min(candidates, key=lambda heading: sum(other in heading for other in sections)))
+    return True
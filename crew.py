@@ -1,6 +1,8 @@
 from crewai import Crew, Process
-from agents import venue_coordinator, logistics_manager, marketing_communications_agent
+from agents import create_venue_coordinator, create_logistics_manager, create_marketing_agent
 from tasks import create_tasks
+from config import RUN_DEADLINE_SECONDS, VERBOSE
+from crew_pool import CrewPool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,8 +25,13 @@ def safe_step_callback(step):
         logger.warning(f"Step callback error (non-critical): {e}")
 
 def create_event_management_crew():
-    """Create and configure the event management crew"""
+    """Create and configure an independent event management crew"""
     try:
+        # Every crew gets its own agents, LLM clients and tool handles
+        venue_coordinator = create_venue_coordinator()
+        logistics_manager = create_logistics_manager()
+        marketing_communications_agent = create_marketing_agent()
+
         # Create tasks with the agents
         venue_task, logistics_task, marketing_task = create_tasks(
             venue_coordinator, 
@@ -45,14 +52,14 @@ def create_event_management_crew():
                 marketing_task
             ],
             process=Process.sequential,  # Sequential process for better reliability
-            verbose=True,
+            verbose=VERBOSE,  # Reasoning dumps are slow under concurrent runs
             max_rpm=8,  # Conservative rate limiting
             share_crew=False,  # Disable crew sharing for privacy
             full_output=True,  # Get full output for better debugging
             step_callback=safe_step_callback,  # Safe callback function
             memory=False,  # Disable memory to avoid potential issues
             cache=False,  # Disable cache for fresh results
-            max_execution_time=3600,  # 1 hour timeout for entire crew
+            max_execution_time=RUN_DEADLINE_SECONDS,  # Same deadline as the run itself
         )
         
         logger.info("Event management crew created successfully")
@@ -62,5 +69,5 @@ def create_event_management_crew():
         logger.error(f"Failed to create crew: {e}")
         raise e
 
-# Create the crew instance
-event_management_crew = create_event_management_crew()
\ No newline at end of file
+# Shared pool of isolated crews; warmed by the application at startup
+crew_pool = CrewPool(factory=create_event_management_crew)
\ No newline at end of file
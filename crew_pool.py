@@ -0,0 +1,178 @@
+from config import (
+    RUN_DEADLINE_SECONDS,
+    AGENT_MAX_ITER,
+    AGENT_MAX_EXECUTION_TIME,
+    CREW_POOL_SIZE,
+    CREW_POOL_WARM,
+    CREW_CHECKOUT_TIMEOUT,
+    active_threads,
+)
+from budget import attach_run_budget
+from collections import deque
+from contextlib import contextmanager
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def set_output_dir(crew, output_dir):
+    """Point the crew's task output files at a run's own directory"""
+    os.makedirs(output_dir, exist_ok=True)
+    for task in crew.tasks:
+        if task.output_file:
+            task.output_file = os.path.join(output_dir, os.path.basename(task.output_file))
+
+def reset_crew(crew, step_callback=None):
+    """Clear per-run state so a crew can be reused by the next run
+
+    step_callback is the crew-level step callback the crew was built with.
+    """
+    # crewai only copies crew callbacks onto tasks and agents whose own callback is unset
+    for task in crew.tasks:
+        task.output = None
+        task.callback = None
+        if task.output_file:
+            task.output_file = os.path.basename(task.output_file)
+    for agent in crew.agents:
+        agent.step_callback = None
+        agent.max_iter = AGENT_MAX_ITER
+        agent.max_execution_time = AGENT_MAX_EXECUTION_TIME
+    attach_run_budget(crew.agents, None)
+    crew.step_callback = step_callback
+    crew.task_callback = None
+    crew.max_execution_time = RUN_DEADLINE_SECONDS
+
+class CrewPool:
+    """Bounded pool of pre-built, isolated crews checked out one per run"""
+
+    def __init__(self, factory, size=CREW_POOL_SIZE):
+        self.size = max(1, size)
+        self.factory = factory
+        self._idle = deque()
+        self._created = 0
+        self._step_callbacks = {}  # id(crew) -> step callback the crew was built with
+        # Notified whenever a crew goes back to the pool or a slot is freed
+        self._available = threading.Condition()
+        self._stats = {
+            "construction_seconds": [],
+            "checkout_wait_seconds": [],
+            "warm_up_seconds": None,
+            "discarded": 0,
+        }
+
+    def _free_slot(self):
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _build(self):
+        """Build a crew for an already reserved slot, freeing the slot if that fails"""
+        started = time.perf_counter()
+        try:
+            crew = self.factory()
+        except Exception:
+            self._free_slot()
+            raise
+        elapsed = time.perf_counter() - started
+        with self._available:
+            self._stats["construction_seconds"].append(round(elapsed, 3))
+            self._step_callbacks[id(crew)] = crew.step_callback
+        logger.info(f"Crew built in {elapsed:.2f}s")
+        return crew
+
+    def _put_idle(self, crew):
+        with self._available:
+            self._idle.append(crew)
+            self._available.notify()
+
+    def warm_up(self, count=CREW_POOL_WARM):
+        """Build up to count crews ahead of time"""
+        started = time.perf_counter()
+        built = 0
+        for _ in range(min(count, self.size)):
+            with self._available:
+                if self._created >= self.size:
+                    break
+                self._created += 1
+            try:
+                crew = self._build()
+            except Exception as e:
+                logger.error(f"Crew warm-up failed: {e}")
+                break
+            self._put_idle(crew)
+            built += 1
+        elapsed = time.perf_counter() - started
+        with self._available:
+            self._stats["warm_up_seconds"] = round(elapsed, 3)
+        logger.info(f"Crew pool warmed with {built} crew(s) in {elapsed:.2f}s")
+
+    def warm_up_async(self, count=CREW_POOL_WARM):
+        """Warm the pool in a background thread"""
+        thread = threading.Thread(target=self.warm_up, args=(count,), name="crew-pool-warm-up", daemon=True)
+        active_threads.append(thread)
+        thread.start()
+        return thread
+
+    def acquire(self, timeout=CREW_CHECKOUT_TIMEOUT):
+        """Take an idle crew, building one if below capacity, else wait for a return"""
+        started = time.perf_counter()
+        wait_until = time.monotonic() + timeout
+        crew = None
+        with self._available:
+            # Re-check after every wake-up: a returned crew or a freed slot both end the wait
+            while not self._idle and self._created >= self.size:
+                remaining = wait_until - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No crew available after waiting {timeout} seconds")
+                self._available.wait(remaining)
+            if self._idle:
+                crew = self._idle.popleft()
+            else:
+                self._created += 1
+        if crew is None:
+            crew = self._build()
+        waited = time.perf_counter() - started
+        with self._available:
+            self._stats["checkout_wait_seconds"].append(round(waited, 3))
+        return crew
+
+    def release(self, crew):
+        """Reset a crew and return it to the pool, discarding it if the reset fails"""
+        try:
+            reset_crew(crew, self._step_callbacks.get(id(crew)))
+        except Exception as e:
+            logger.warning(f"Discarding crew that could not be reset: {e}")
+            with self._available:
+                self._step_callbacks.pop(id(crew), None)
+                self._stats["discarded"] += 1
+            self._free_slot()
+            return
+        self._put_idle(crew)
+
+    @contextmanager
+    def checkout(self, timeout=CREW_CHECKOUT_TIMEOUT):
+        """Context manager that checks a crew out for one run"""
+        crew = self.acquire(timeout)
+        try:
+            yield crew
+        finally:
+            self.release(crew)
+
+    def stats(self):
+        """Return pool size and timing statistics"""
+        with self._available:
+            construction = self._stats["construction_seconds"]
+            waits = self._stats["checkout_wait_seconds"]
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "discarded": self._stats["discarded"],
+                "warm_up_seconds": self._stats["warm_up_seconds"],
+                "avg_construction_seconds": round(sum(construction) / len(construction), 3) if construction else None,
+                "checkouts": len(waits),
+                "avg_checkout_wait_seconds": round(sum(waits) / len(waits), 3) if waits else None,
+                "max_checkout_wait_seconds": max(waits) if waits else None,
+            }
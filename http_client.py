@@ -0,0 +1,264 @@
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP2_ENABLED,
+    DNS_CACHE_TTL,
+)
+import atexit
+import logging
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class PoolStats:
+    """Thread-safe counters for connection reuse and pool wait time per client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, client):
+        return self._stats.setdefault(client, {
+            "requests": 0,
+            "new_connections": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        })
+
+    def record_request(self, client):
+        with self._lock:
+            self._entry(client)["requests"] += 1
+
+    def record_new_connection(self, client):
+        with self._lock:
+            self._entry(client)["new_connections"] += 1
+
+    def record_wait(self, client, seconds):
+        with self._lock:
+            entry = self._entry(client)
+            entry["wait_seconds"] += seconds
+            entry["max_wait_seconds"] = max(entry["max_wait_seconds"], seconds)
+
+    def snapshot(self):
+        """Return per-client stats including reuse ratio and average wait"""
+        with self._lock:
+            result = {}
+            for client, entry in self._stats.items():
+                requests_made = entry["requests"]
+                reused = max(0, requests_made - entry["new_connections"])
+                result[client] = {
+                    "requests": requests_made,
+                    "new_connections": entry["new_connections"],
+                    "reuse_ratio": round(reused / requests_made, 3) if requests_made else 0.0,
+                    "avg_wait_ms": round(1000 * entry["wait_seconds"] / requests_made, 2) if requests_made else 0.0,
+                    "max_wait_ms": round(1000 * entry["max_wait_seconds"], 2),
+                }
+            return result
+
+pool_stats = PoolStats()
+
+def get_pool_stats():
+    """Return connection pool statistics for all shared HTTP clients"""
+    return pool_stats.snapshot()
+
+# DNS caching
+DNS_CACHE_MAX_ENTRIES = 512
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache = {}  # getaddrinfo arguments -> (timestamp, result)
+_dns_cache_lock = threading.Lock()
+_dns_cache_installed = False
+
+def _purge_dns_cache(now):
+    """Drop expired entries, then the oldest ones while over DNS_CACHE_MAX_ENTRIES (lock held)"""
+    for key in [key for key, (cached_at, _) in _dns_cache.items() if now - cached_at >= DNS_CACHE_TTL]:
+        del _dns_cache[key]
+    while len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+        del _dns_cache[min(_dns_cache, key=lambda key: _dns_cache[key][0])]
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.time()
+    with _dns_cache_lock:
+        entry = _dns_cache.get(key)
+        if entry is not None:
+            if now - entry[0] < DNS_CACHE_TTL:
+                return entry[1]
+            del _dns_cache[key]
+    result = _original_getaddrinfo(*args, **kwargs)
+    with _dns_cache_lock:
+        _purge_dns_cache(now)
+        _dns_cache[key] = (now, result)
+    return result
+
+def install_dns_cache():
+    """Cache getaddrinfo lookups for DNS_CACHE_TTL seconds
+
+    This patches socket.getaddrinfo for the whole process until uninstall_dns_cache().
+    """
+    global _dns_cache_installed
+    if _dns_cache_installed or DNS_CACHE_TTL <= 0:
+        return
+    socket.getaddrinfo = _cached_getaddrinfo
+    _dns_cache_installed = True
+    logger.info(f"DNS cache enabled (ttl={DNS_CACHE_TTL}s)")
+
+def uninstall_dns_cache():
+    """Restore the original socket.getaddrinfo and clear the DNS cache"""
+    global _dns_cache_installed
+    if not _dns_cache_installed:
+        return
+    if socket.getaddrinfo is _cached_getaddrinfo:
+        socket.getaddrinfo = _original_getaddrinfo
+    with _dns_cache_lock:
+        _dns_cache.clear()
+    _dns_cache_installed = False
+
+# requests / urllib3 pool used by the search and scrape tools.
+# urllib3 only limits connections per host, so every host pool also takes one of
+# these slots when it checks a connection out. The slot is given back when urllib3
+# returns the connection to its pool, i.e. once the response body is read or closed.
+_connection_slots = threading.BoundedSemaphore(max(1, HTTP_MAX_CONNECTIONS))
+
+def _release_connection_slot():
+    try:
+        _connection_slots.release()
+    except ValueError:
+        logger.debug("Connection returned without a slot")
+
+class _TimedPoolMixin:
+    """urllib3 pool mixin that enforces the global connection limit and records wait time and new connections"""
+
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        _connection_slots.acquire()
+        try:
+            return super()._get_conn(timeout=timeout)
+        except BaseException:
+            _release_connection_slot()
+            raise
+        finally:
+            pool_stats.record_wait("requests", time.perf_counter() - started)
+
+    def _put_conn(self, conn):
+        try:
+            super()._put_conn(conn)
+        finally:
+            _release_connection_slot()
+
+    def _new_conn(self):
+        pool_stats.record_new_connection("requests")
+        return super()._new_conn()
+
+class _TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    pass
+
+class _TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    pass
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools share the global connection limit and report statistics"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+_session = None
+_httpx_client = None
+_client_lock = threading.Lock()
+
+def _count_request(response, *args, **kwargs):
+    pool_stats.record_request("requests")
+    return response
+
+def get_session():
+    """Return the process-wide keep-alive requests session"""
+    global _session
+    with _client_lock:
+        if _session is None:
+            install_dns_cache()
+            session = requests.Session()
+            adapter = PooledHTTPAdapter(
+                pool_connections=HTTP_MAX_CONNECTIONS,  # Number of per-host pools kept, not a connection limit
+                pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+                pool_block=True  # Wait for a free connection instead of opening extras
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.hooks["response"].append(_count_request)
+            _session = session
+            logger.info("Shared HTTP session initialized")
+        return _session
+
+def _http2_available():
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.info("Package 'h2' not installed, LLM client will use HTTP/1.1")
+        return False
+
+def _trace_request(request):
+    """httpx request hook that records new connections and pool wait via httpcore tracing"""
+    state = {"start": time.perf_counter(), "connect": 0.0, "connect_started": None}
+
+    def trace(event_name, info):
+        now = time.perf_counter()
+        if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            if event_name == "connection.connect_tcp.started":
+                pool_stats.record_new_connection("httpx")
+            state["connect_started"] = now
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if state["connect_started"] is not None:
+                state["connect"] += now - state["connect_started"]
+                state["connect_started"] = None
+        elif event_name.endswith("send_request_headers.started"):
+            # Time before the request hit the wire, minus any time spent connecting
+            pool_stats.record_wait("httpx", max(0.0, now - state["start"] - state["connect"]))
+
+    request.extensions["trace"] = trace
+    pool_stats.record_request("httpx")
+
+def get_httpx_client():
+    """Return the process-wide keep-alive httpx client used by LLM SDKs"""
+    global _httpx_client
+    with _client_lock:
+        if _httpx_client is None:
+            install_dns_cache()
+            _httpx_client = httpx.Client(
+                http2=_http2_available(),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                event_hooks={"request": [_trace_request]}
+            )
+            logger.info("Shared LLM HTTP client initialized")
+        return _httpx_client
+
+def close_clients():
+    """Close shared HTTP clients"""
+    global _session, _httpx_client
+    with _client_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _httpx_client is not None:
+            _httpx_client.close()
+            _httpx_client = None
+    uninstall_dns_cache()
+
+atexit.register(close_clients)
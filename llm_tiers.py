@@ -0,0 +1,57 @@
+from langchain_core.callbacks import CallbackManager
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatResult
+import logging
+
+logger = logging.getLogger(__name__)
+
+# crewai's ReAct prompt makes the agent prefix its last message with this marker
+FINAL_ANSWER_MARKER = "Final Answer:"
+# ...and prefix a tool call with this one
+ACTION_MARKER = "Action:"
+
+def _child_callbacks(run_manager):
+    """Callback manager nesting an inner model call under this model's run
+
+    LLM run managers have no get_child(), so this builds the same manager by hand.
+    """
+    if run_manager is None:
+        return None
+    manager = CallbackManager(handlers=[], parent_run_id=run_manager.run_id)
+    manager.set_handlers(run_manager.inheritable_handlers)
+    manager.add_tags(run_manager.inheritable_tags)
+    manager.add_metadata(run_manager.inheritable_metadata)
+    return manager
+
+class TieredChatModel(BaseChatModel):
+    """Chat model that runs tool-selection steps on a fast model and final answers on a strong one
+
+    Every step goes to the fast model first, which is stopped at the final
+    answer marker. If it did not choose a tool action, the prompt goes to the
+    strong model, so the final answer is only generated once, by the larger model.
+    """
+
+    fast_llm: BaseChatModel
+    strong_llm: BaseChatModel
+    agent_role: str = "default"
+
+    @property
+    def _llm_type(self):
+        return "tiered-chat"
+
+    @property
+    def _identifying_params(self):
+        return {
+            "agent_role": self.agent_role,
+            "fast_llm": self.fast_llm._llm_type,
+            "strong_llm": self.strong_llm._llm_type,
+        }
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        callbacks = _child_callbacks(run_manager)
+        fast_stop = list(stop or []) + [FINAL_ANSWER_MARKER]
+        result = self.fast_llm.generate([messages], stop=fast_stop, callbacks=callbacks, **kwargs)
+        if ACTION_MARKER not in result.generations[0][0].text:
+            logger.info(f"{self.agent_role} is answering, handing the final answer to the strong model")
+            result = self.strong_llm.generate([messages], stop=stop, callbacks=callbacks, **kwargs)
+        return ChatResult(generations=result.generations[0], llm_output=result.llm_output)
@@ -0,0 +1,161 @@
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+
+# Context attached to every log record emitted from the current thread
+_run_id = contextvars.ContextVar("run_id", default=None)
+_agent_role = contextvars.ContextVar("agent_role", default=None)
+
+_listener = None
+_queue_handler = None
+
+def bind_run(run_id):
+    """Tag log records from the current thread with a run ID"""
+    _run_id.set(run_id)
+
+def bind_agent(agent_role):
+    """Tag log records from the current thread with an agent role"""
+    _agent_role.set(agent_role)
+
+class ContextFilter(logging.Filter):
+    """Adds run_id and agent_role from the caller's context to each record"""
+
+    def filter(self, record):
+        record.run_id = _run_id.get()
+        record.agent_role = _agent_role.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keeps a configurable fraction of records per level; unlisted levels are always kept"""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped when the queue is full
+
+    Only the message is merged and truncated on the calling thread; all
+    formatting and I/O happens on the listener thread.
+    """
+
+    def __init__(self, log_queue, max_message_chars):
+        super().__init__(log_queue)
+        self.max_message_chars = max_message_chars
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        message = record.getMessage()
+        if self.max_message_chars and len(message) > self.max_message_chars:
+            message = f"{message[:self.max_message_chars]}... [truncated {len(message) - self.max_message_chars} chars]"
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener that waits for queue space for its stop sentinel"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "agent_role": getattr(record, "agent_role", None),
+            "thread": record.threadName,
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+def parse_sample_rates(spec):
+    """Parse 'DEBUG=0.1,INFO=1.0' into {levelno: rate}"""
+    rates = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        level_name, rate = part.split("=", 1)
+        level = logging.getLevelName(level_name.strip().upper())
+        try:
+            if isinstance(level, int):
+                rates[level] = max(0.0, min(1.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+def configure_logging(level=logging.INFO, log_format="json", log_file=None,
+                      queue_size=10000, max_message_chars=2000, sample_rates=None):
+    """Route all logging through a bounded queue to a background listener thread"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    if log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(run_id)s - %(agent_role)s - %(name)s - %(levelname)s - %(message)s')
+
+    output_handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        output_handlers.append(logging.FileHandler(log_file))
+    for handler in output_handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue, max_message_chars)
+    _queue_handler.addFilter(SamplingFilter(sample_rates or {}))
+    _queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = _DrainingQueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def dropped_records():
+    """Return how many records were dropped because the queue was full"""
+    return _queue_handler.dropped if _queue_handler else 0
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    dropped = dropped_records()
+    if dropped:
+        logging.getLogger(__name__).warning(f"{dropped} log records were dropped because the log queue was full")
+    _listener.stop()
+    _listener = None
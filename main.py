@@ -1,5 +1,19 @@
-from crew import event_management_crew
-from config import validate_config, check_api_quotas, shutdown_event
+from crew import crew_pool
+from crew_pool import set_output_dir
+from config import (
+    validate_config,
+    check_api_quotas,
+    shutdown_event,
+    RUN_RECORD_FILE,
+    OUTPUT_DIR,
+    CREW_CHECKOUT_TIMEOUT,
+)
+from http_client import get_pool_stats
+from budget import RunBudget, attach_run_budget
+from scheduler import RunDeadline, DeadlineScheduler
+from log_pipeline import bind_run
+from profiling import RunProfiler
+from contextlib import nullcontext
 from datetime import datetime
 import logging
 import time
@@ -8,12 +22,10 @@ import os
 import signal
 import threading
 import json
+import uuid
+import argparse
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by config (queue-based pipeline)
 logger = logging.getLogger(__name__)
 
 # Global flag for graceful shutdown
@@ -157,17 +169,54 @@ def display_event_summary(event_details):
         else:
             print("Please enter 'y' for yes or 'n' for no.")
 
-def run_crew_safely(event_details, timeout_seconds=2400):  # 40 minute timeout
+def run_output_dir(run_id):
+    """Return the directory holding a run's output files and run record"""
+    return os.path.join(OUTPUT_DIR, run_id)
+
+def write_run_record(record, output_dir):
+    """Write the result record of a crew run to RUN_RECORD_FILE in the run's directory"""
+    record_file = os.path.join(output_dir, RUN_RECORD_FILE)
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(record_file, "w") as f:
+            json.dump(record, f, indent=2, default=str)
+        logger.info(f"Run record written to {record_file}")
+    except OSError as e:
+        logger.warning(f"Could not write run record: {e}")
+
+def run_crew_safely(event_details, deadline=None, profiler=None, attempt=1, run_id=None):
     """Run crew with timeout and error handling"""
     result = None
     error = None
+    run_id = run_id or uuid.uuid4().hex[:12]
+    output_dir = run_output_dir(run_id)
+    run_budget = RunBudget(run_id)
+    deadline = deadline or RunDeadline()
+    timeout_seconds = int(deadline.remaining())
     
     def crew_runner():
         nonlocal result, error
+        started_at = datetime.now()
+        scheduler = None
+        bind_run(run_id)
+        phase_prefix = f"attempt{attempt}:"
         try:
-            logger.info("Starting crew execution...")
-            logger.info(f"Event: {event_details['event_topic']} in {event_details['event_city']}")
-            result = event_management_crew.kickoff(inputs=event_details)
+            # Each run gets its own isolated crew from the pool
+            if profiler:
+                profiler.start_phase(f"{phase_prefix}crew_checkout")
+            with crew_pool.checkout(min(CREW_CHECKOUT_TIMEOUT, deadline.remaining())) as crew:
+                set_output_dir(crew, output_dir)
+                attach_run_budget(crew.agents, run_budget)
+                scheduler = DeadlineScheduler(crew, deadline)
+                scheduler.start()
+                if profiler:
+                    profiler.attach(crew, phase_prefix)
+                try:
+                    logger.info(f"Starting crew execution (run {run_id})...")
+                    logger.info(f"Event: {event_details['event_topic']} in {event_details['event_city']}")
+                    result = crew.kickoff(inputs=event_details)
+                finally:
+                    scheduler.finish()
             logger.info("Crew execution completed successfully")
         except Exception as e:
             error = e
@@ -175,6 +224,27 @@ def run_crew_safely(event_details, timeout_seconds=2400):  # 40 minute timeout
             # Log more details for debugging
             import traceback
             logger.error(f"Full traceback: {traceback.format_exc()}")
+        finally:
+            if profiler:
+                profiler.stop_phase()
+            usage = run_budget.summary()
+            logger.info(f"Token usage: {usage['totals']}")
+            logger.info(f"HTTP pool stats: {get_pool_stats()}")
+            logger.info(f"Crew pool stats: {crew_pool.stats()}")
+            write_run_record({
+                "run_id": run_id,
+                "output_dir": output_dir,
+                "event": event_details,
+                "started_at": started_at.isoformat(),
+                "duration_seconds": round((datetime.now() - started_at).total_seconds(), 2),
+                "status": "failed" if error else "completed",
+                "error": str(error) if error else None,
+                "token_usage": usage,
+                "schedule": scheduler.summary() if scheduler else None,
+                "http_pool": get_pool_stats(),
+                "crew_pool": crew_pool.stats(),
+                "profile_dir": profiler.output_dir if profiler else None,
+            }, output_dir)
     
     # Run crew in a separate thread with timeout
     crew_thread = threading.Thread(target=crew_runner, daemon=True)
@@ -213,21 +283,30 @@ def parse_crew_output(result):
         logger.warning(f"Could not parse crew output: {e}")
         return {"Raw Output": str(result)}
 
-def run_crew_with_retry(event_details, max_retries=2):
-    """Run crew with retry logic for rate limiting"""
+def run_crew_with_retry(event_details, max_retries=2, profiler=None):
+    """Run crew with retry logic for rate limiting
+
+    Returns (result, output_dir) of the successful attempt, or (None, None).
+    """
+    # All attempts share one end-to-end deadline
+    deadline = RunDeadline()
     for attempt in range(max_retries):
         if is_shutting_down:
             break
+        if deadline.expired():
+            logger.error("Run deadline reached, no time left for another attempt")
+            break
             
         try:
             logger.info(f"Starting crew execution (attempt {attempt + 1}/{max_retries})")
             print(f"\n🚀 Starting AI agents (attempt {attempt + 1}/{max_retries})...")
             print("This may take 10-15 minutes. Please be patient...\n")
             
-            result, error = run_crew_safely(event_details)
+            run_id = uuid.uuid4().hex[:12]
+            result, error = run_crew_safely(event_details, deadline, profiler, attempt + 1, run_id)
             
             if result:
-                return result
+                return result, run_output_dir(run_id)
             elif error:
                 error_msg = str(error)
                 
@@ -244,7 +323,8 @@ def run_crew_with_retry(event_details, max_retries=2):
                 # Check if it's a rate limiting error
                 elif any(term in error_msg.lower() for term in ["resourceexhausted", "429", "rate", "quota", "limit"]):
                     if attempt < max_retries - 1:
-                        wait_time = min(60 * (2 ** attempt), 300)  # Max 5 minutes
+                        # Max 5 minutes, and never past the run deadline
+                        wait_time = min(60 * (2 ** attempt), 300, int(deadline.remaining()))
                         logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds before retry...")
                         print(f"⏳ Rate limit hit. Waiting {wait_time} seconds...")
                         print("💡 Tip: Consider upgrading your API plan for faster processing")
@@ -252,7 +332,7 @@ def run_crew_with_retry(event_details, max_retries=2):
                         # Wait with periodic checks for shutdown
                         for i in range(wait_time):
                             if is_shutting_down:
-                                return None
+                                return None, None
                             if i % 30 == 0:  # Update every 30 seconds
                                 print(f"   Waiting... {wait_time - i} seconds remaining")
                             time.sleep(1)
@@ -284,26 +364,29 @@ def run_crew_with_retry(event_details, max_retries=2):
                 
         except KeyboardInterrupt:
             logger.info("Execution interrupted by user")
-            return None
+            return None, None
         except Exception as e:
             if attempt == max_retries - 1:
                 raise e
             logger.warning(f"Attempt {attempt + 1} failed: {e}")
             print(f"❌ Attempt {attempt + 1} failed. Retrying...")
     
-    return None
+    return None, None
 
-def display_results(event_details):
-    """Display formatted results from output files"""
+def display_results(event_details, output_dir="."):
+    """Display formatted results from the output files in output_dir"""
+    venue_file = os.path.join(output_dir, "venue_details.json")
+    logistics_file = os.path.join(output_dir, "logistics_plan.md")
+    marketing_file = os.path.join(output_dir, "marketing_strategy.md")
     print("\n" + "="*80)
     print("                    🎉 EVENT PLANNING COMPLETE! 🎉")
     print("="*80)
     
     # Venue Details
-    if os.path.exists("venue_details.json"):
+    if os.path.exists(venue_file):
         print("\n📋 VENUE DETAILS")
         print("-" * 50)
-        with open("venue_details.json", "r") as f:
+        with open(venue_file, "r") as f:
             content = f.read()
             try:
                 venue_data = json.loads(content)
@@ -322,10 +405,10 @@ def display_results(event_details):
         print("❌ Venue details not generated")
 
     # Logistics Plan
-    if os.path.exists("logistics_plan.md"):
+    if os.path.exists(logistics_file):
         print("\n📋 LOGISTICS PLAN")
         print("-" * 50)
-        with open("logistics_plan.md", "r") as f:
+        with open(logistics_file, "r") as f:
             content = f.read()
             print(content[:500] + "..." if len(content) > 500 else content)
     else:
@@ -334,10 +417,10 @@ def display_results(event_details):
         print("❌ Logistics plan not generated")
 
     # Marketing Strategy
-    if os.path.exists("marketing_strategy.md"):
+    if os.path.exists(marketing_file):
         print("\n📋 MARKETING STRATEGY")
         print("-" * 50)
-        with open("marketing_strategy.md", "r") as f:
+        with open(marketing_file, "r") as f:
             content = f.read()
             print(content[:500] + "..." if len(content) > 500 else content)
     else:
@@ -350,9 +433,9 @@ def display_results(event_details):
     print("📁 GENERATED FILES:")
     print("="*80)
     files_info = [
-        ("venue_details.json", "Venue booking information"),
-        ("logistics_plan.md", "Catering & equipment details"),
-        ("marketing_strategy.md", "Promotion & outreach plan")
+        (venue_file, "Venue booking information"),
+        (logistics_file, "Catering & equipment details"),
+        (marketing_file, "Promotion & outreach plan")
     ]
     files_created = False
     for filename, description in files_info:
@@ -369,11 +452,15 @@ def display_results(event_details):
         print("\n⚠️ No output files were generated.")
     print("="*80)
 
-def main():
+def main(profile=False):
+    profiler = RunProfiler() if profile else None
     try:
         print("🤖 Welcome to the AI Event Management System!")
         print("This system uses AI agents to help plan your event.\n")
         
+        # Build crews in the background while the user enters event details
+        crew_pool.warm_up_async()
+        
         # Show API quota information
         check_api_quotas()
         print("\n" + "="*60)
@@ -396,10 +483,13 @@ def main():
         print("📧 Press Ctrl+C to cancel at any time.\n")
         
         # Run the crew with retry logic
-        result = run_crew_with_retry(event_details)
+        if profiler:
+            profiler.start()
+        result, output_dir = run_crew_with_retry(event_details, profiler=profiler)
         
         if result and not is_shutting_down:
-            display_results(event_details) 
+            with profiler.phase("display_results") if profiler else nullcontext():
+                display_results(event_details, output_dir)
             
             print("\n🎯 Next Steps:")
             print("1. Review the generated files for detailed information")
@@ -430,17 +520,30 @@ def main():
         print("6. Check your internet connection")
         sys.exit(1)
     finally:
+        if profiler and profiler.running:
+            profiler.finish()
         # Ensure clean shutdown
         shutdown_event.set()
 
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="AI Event Management System")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile CPU, memory and wait time per task and write artifacts to PROFILE_DIR"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     try:
         # Validate configuration
         if not validate_config():
             print("❌ Configuration validation failed. Please check your .env file.")
             sys.exit(1)
         
-        main()
+        main(profile=args.profile)
     except KeyboardInterrupt:
         print("\n👋 Program interrupted. Goodbye!")
         sys.exit(0)
@@ -0,0 +1,268 @@
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+TOP_N = 10
+
+# Leaf frames that mean the thread is waiting rather than computing
+WAIT_FILES = ("socket.py", "ssl.py", "selectors.py", "client.py", "threading.py", "queue.py")
+WAIT_FUNCTIONS = {"wait", "sleep", "acquire", "select", "poll", "recv", "recv_into", "readinto", "read", "connect"}
+
+def _is_local(filename):
+    return filename.startswith(PROJECT_DIR) and "site-packages" not in filename
+
+def _format_func(key):
+    filename, line, function = key
+    if filename == "~":
+        return function
+    return f"{os.path.relpath(filename, PROJECT_DIR) if _is_local(filename) else filename}:{line}({function})"
+
+def _wait_category(key):
+    """Classify a cProfile entry as a kind of blocking wait, or None"""
+    function = key[2]
+    if "_socket.socket" in function or "_ssl._SSLSocket" in function or "select." in function:
+        return "network"
+    if "time.sleep" in function:
+        return "sleep"
+    if "acquire' of '_thread" in function:
+        return "lock"
+    return None
+
+class _ThreadSampler(threading.Thread):
+    """Samples the stacks of the run's threads and attributes them to the active phase"""
+
+    def __init__(self, profiler, interval, ignored_threads):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.ignored_threads = ignored_threads
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            phase = self.profiler.current_phase
+            if phase is None:
+                continue
+            phase_thread = self.profiler.phase_thread
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                # Pre-existing threads only count while they run the phase themselves
+                if ident in self.ignored_threads and ident != phase_thread:
+                    continue
+                self.profiler.record_sample(phase, frame)
+
+class RunProfiler:
+    """Per-phase CPU, allocation and wait-time profiling for a run, written to PROFILE_DIR"""
+
+    def __init__(self, output_dir=PROFILE_DIR, sample_interval=PROFILE_SAMPLE_INTERVAL):
+        self.session_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.output_dir = os.path.join(output_dir, self.session_id)
+        self.sample_interval = sample_interval
+        self.current_phase = None
+        self.phase_thread = None
+        self.phases = {}
+        self._active = None
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._started_tracemalloc = False
+        self.running = False
+
+    def start(self):
+        """Start memory tracing and the stack sampler"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+        # Threads that already exist (main thread, log listener) are not part of the run,
+        # except the main thread while it runs a phase such as display_results
+        ignored = set(sys._current_frames())
+        self._sampler = _ThreadSampler(self, self.sample_interval, ignored)
+        self._sampler.start()
+        self.running = True
+        logger.info(f"Profiling enabled, writing artifacts to {self.output_dir}")
+
+    def record_sample(self, phase, frame):
+        leaf = frame.f_code
+        local = None
+        while frame is not None:
+            if _is_local(frame.f_code.co_filename):
+                local = f"{os.path.relpath(frame.f_code.co_filename, PROJECT_DIR)}:{frame.f_code.co_name}"
+                break
+            frame = frame.f_back
+        waiting = os.path.basename(leaf.co_filename) in WAIT_FILES or leaf.co_name in WAIT_FUNCTIONS
+        with self._lock:
+            samples = self._samples.setdefault(phase, {"total": 0, "waiting": 0, "leaf": Counter(), "local": Counter()})
+            samples["total"] += 1
+            samples["waiting"] += waiting
+            samples["leaf"][f"{os.path.basename(leaf.co_filename)}:{leaf.co_name}"] += 1
+            if local:
+                samples["local"][local] += 1
+
+    def start_phase(self, name):
+        """End the active phase (if any) and start profiling a new one on this thread"""
+        self.stop_phase()
+        profile = cProfile.Profile()
+        # Take the baseline snapshot first so it does not count toward the phase
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if snapshot is not None:
+            tracemalloc.reset_peak()
+        self._active = {
+            "name": name,
+            "profile": profile,
+            "thread": threading.get_ident(),
+            "wall": time.perf_counter(),
+            "cpu": time.thread_time(),
+            "snapshot": snapshot,
+        }
+        self.phase_thread = threading.get_ident()
+        self.current_phase = name
+        profile.enable()
+
+    def stop_phase(self):
+        """Stop the active phase and write its profile artifact"""
+        active, self._active = self._active, None
+        self.current_phase = None
+        self.phase_thread = None
+        if active is None:
+            return
+
+        same_thread = active["thread"] == threading.get_ident()
+        if same_thread:
+            active["profile"].disable()
+        wall = time.perf_counter() - active["wall"]
+        phase = {"wall_seconds": round(wall, 3)}
+
+        if same_thread:
+            cpu = time.thread_time() - active["cpu"]
+            phase["cpu_seconds"] = round(cpu, 3)
+            phase["blocked_seconds"] = round(max(0.0, wall - cpu), 3)
+            phase.update(self._cprofile_summary(active["name"], active["profile"]))
+        else:
+            # cProfile hooks are per thread; this phase ended on another thread
+            logger.debug(f"Phase {active['name']} ended on another thread, skipping cProfile data")
+
+        if active["snapshot"] is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            phase["peak_memory_mb"] = round(peak / (1024 * 1024), 2)
+            diff = tracemalloc.take_snapshot().compare_to(active["snapshot"], "lineno")
+            phase["top_allocations"] = [
+                {"location": str(stat.traceback[0]), "size_kb": round(stat.size_diff / 1024, 1)}
+                for stat in diff[:5]
+            ]
+
+        with self._lock:
+            self.phases[active["name"]] = phase
+
+    def _cprofile_summary(self, name, profile):
+        filename = os.path.join(self.output_dir, f"{name.replace(':', '_').replace('/', '_')}.prof")
+        profile.dump_stats(filename)
+        stats = pstats.Stats(profile).stats
+
+        by_own_time = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        waits = Counter()
+        for key, (_, _, own_time, _, _) in stats.items():
+            category = _wait_category(key)
+            if category:
+                waits[category] += own_time
+
+        return {
+            "profile_file": filename,
+            "io_wait_seconds": {category: round(seconds, 3) for category, seconds in waits.items()},
+            "top_functions": [
+                {"function": _format_func(key), "own_seconds": round(value[2], 4), "calls": value[1]}
+                for key, value in by_own_time[:TOP_N]
+            ],
+            "top_local_functions": [
+                {"function": _format_func(key), "own_seconds": round(value[2], 4), "cumulative_seconds": round(value[3], 4)}
+                for key, value in by_own_time if _is_local(key[0])
+            ][:TOP_N],
+        }
+
+    @contextmanager
+    def phase(self, name):
+        """Profile the enclosed block as one phase"""
+        self.start_phase(name)
+        try:
+            yield
+        finally:
+            self.stop_phase()
+
+    def attach(self, crew, prefix=""):
+        """Profile each of the crew's tasks as its own phase, switching on task completion
+
+        The callbacks are set on the tasks themselves and are removed when the crew is reset.
+        """
+        task_names = [
+            f"{prefix}task:{os.path.basename(getattr(task, 'output_file', None) or '') or index}"
+            for index, task in enumerate(crew.tasks)
+        ]
+        crew_task_callback = getattr(crew, "task_callback", None)
+
+        def task_callback(index, previous_callback):
+            def on_task_complete(output):
+                if previous_callback:
+                    previous_callback(output)
+                if index + 1 < len(task_names):
+                    self.start_phase(task_names[index + 1])
+                else:
+                    self.stop_phase()
+            return on_task_complete
+
+        for index, task in enumerate(crew.tasks):
+            task.callback = task_callback(index, task.callback or crew_task_callback)
+        if task_names:
+            self.start_phase(task_names[0])
+
+    def finish(self):
+        """Stop profiling and write summary.json; returns the summary"""
+        self.stop_phase()
+        self.running = False
+        if self._sampler is not None:
+            self._sampler.stop_event.set()
+            self._sampler.join(timeout=2)
+
+        with self._lock:
+            for name, samples in self._samples.items():
+                phase = self.phases.setdefault(name, {})
+                total = samples["total"]
+                phase["samples"] = {
+                    "count": total,
+                    "waiting_ratio": round(samples["waiting"] / total, 3) if total else 0.0,
+                    "top_leaf_frames": samples["leaf"].most_common(TOP_N),
+                    "top_local_frames": samples["local"].most_common(TOP_N),
+                }
+            summary = {"session_id": self.session_id, "phases": self.phases}
+
+        if tracemalloc.is_tracing():
+            summary["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        summary_file = os.path.join(self.output_dir, "summary.json")
+        with open(summary_file, "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+
+        for name, phase in self.phases.items():
+            local = phase.get("top_local_functions") or []
+            hotspot = local[0]["function"] if local else "n/a"
+            logger.info(
+                f"Profile {name}: wall={phase.get('wall_seconds')}s cpu={phase.get('cpu_seconds')}s "
+                f"blocked={phase.get('blocked_seconds')}s peak={phase.get('peak_memory_mb')}MB top_local={hotspot}"
+            )
+        logger.info(f"Profile summary written to {summary_file}")
+        return summary
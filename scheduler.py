@@ -0,0 +1,204 @@
+from config import (
+    RUN_DEADLINE_SECONDS,
+    AGENT_MAX_ITER,
+    AGENT_MIN_ITER,
+    AGENT_MAX_EXECUTION_TIME,
+    MIN_TASK_SECONDS,
+    SECONDS_PER_ITERATION,
+)
+from contracts import output_satisfies_contract, task_output_name
+from budget import force_final_answer
+from log_pipeline import bind_agent
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Relative share of the remaining run time given to each task, keyed by output file
+TASK_TIME_WEIGHTS = {
+    "venue_details.json": 1.0,
+    "logistics_plan.md": 1.2,
+    "marketing_strategy.md": 1.0,
+}
+
+class RunDeadline:
+    """Wall-clock deadline shared by all attempts of one run"""
+
+    def __init__(self, total_seconds=RUN_DEADLINE_SECONDS):
+        self.total_seconds = total_seconds
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        return max(0.0, self.total_seconds - self.elapsed())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+def _step_texts(step):
+    """Collect the text fragments carried by a crewai step object"""
+    if isinstance(step, (list, tuple)):
+        texts = []
+        for item in step:
+            texts.extend(_step_texts(item))
+        return texts
+    if isinstance(step, str):
+        return [step]
+    texts = []
+    for attribute in ("output", "text", "log", "result"):
+        value = getattr(step, attribute, None)
+        if isinstance(value, str) and value:
+            texts.append(value)
+    return_values = getattr(step, "return_values", None)
+    if isinstance(return_values, dict):
+        texts.extend(str(value) for value in return_values.values())
+    return texts
+
+def _is_final_step(step):
+    return type(step).__name__ == "AgentFinish" or hasattr(step, "return_values")
+
+class DeadlineScheduler:
+    """Splits a run deadline across the crew's remaining tasks and stops agents early"""
+
+    def __init__(self, crew, deadline):
+        self.crew = crew
+        self.deadline = deadline
+        self.tasks = list(crew.tasks)
+        self.completed = 0
+        self.allocations = {}
+        self.task_durations = {}
+        self.early_stops = []
+        self.deadline_stops = []
+        self._task_started = None
+        self._lock = threading.Lock()
+        self._previous_step_callback = None
+        self._previous_task_callbacks = {}
+        self._previous_agent_callbacks = {}
+
+    def _weight(self, task):
+        return TASK_TIME_WEIGHTS.get(task_output_name(task), 1.0)
+
+    def _task_name(self, task):
+        return task_output_name(task) or getattr(getattr(task, "agent", None), "role", "task")
+
+    def _time_slices(self, remaining_tasks, remaining):
+        """Split the remaining seconds by weight so that the slices never add up to more"""
+        total_weight = sum(self._weight(task) for task in remaining_tasks)
+        # MIN_TASK_SECONDS is only a floor while there is enough time to give every task that much
+        floor = min(MIN_TASK_SECONDS, remaining / len(remaining_tasks))
+        slices = [max(floor, remaining * self._weight(task) / total_weight) for task in remaining_tasks]
+        total = sum(slices)
+        if total > remaining:
+            slices = [time_slice * remaining / total for time_slice in slices]
+        # crewai needs a positive limit, so the last second of a run may be shared
+        return [max(1, int(time_slice)) for time_slice in slices]
+
+    def allocate(self):
+        """Give each remaining task a time slice and iteration limit from the remaining deadline"""
+        remaining_tasks = self.tasks[self.completed:]
+        if not remaining_tasks:
+            return
+        remaining = self.deadline.remaining()
+        if remaining <= 0:
+            # No time left to hand out: keep the agents to the minimum and let
+            # on_step force the active agent's final answer
+            for task in remaining_tasks:
+                task.agent.max_execution_time = 1
+                task.agent.max_iter = AGENT_MIN_ITER
+                self.allocations[self._task_name(task)] = {"seconds": 0, "max_iter": AGENT_MIN_ITER}
+            logger.warning(f"Run deadline reached with {len(remaining_tasks)} task(s) left")
+            return
+        for task, time_slice in zip(remaining_tasks, self._time_slices(remaining_tasks, remaining)):
+            max_iter = max(AGENT_MIN_ITER, min(AGENT_MAX_ITER, time_slice // SECONDS_PER_ITERATION))
+            task.agent.max_execution_time = time_slice
+            task.agent.max_iter = max_iter
+            self.allocations[self._task_name(task)] = {"seconds": time_slice, "max_iter": max_iter}
+        logger.info(f"Time allocation ({int(remaining)}s remaining): {self.allocations}")
+
+    def current_task(self):
+        with self._lock:
+            if self.completed < len(self.tasks):
+                return self.tasks[self.completed]
+        return None
+
+    def on_step(self, step):
+        """Step callback: force a final answer once the output meets the task contract
+        or the run deadline has passed"""
+        if self._previous_step_callback:
+            self._previous_step_callback(step)
+        try:
+            task = self.current_task()
+            if task is None or _is_final_step(step):
+                return
+            name = self._task_name(task)
+            if name in self.early_stops or name in self.deadline_stops:
+                return  # Already forced; the agent is finishing
+            if self.deadline.expired():
+                logger.warning(f"Run deadline reached during {name}, finishing now")
+                self.deadline_stops.append(name)
+                force_final_answer(task.agent)
+            elif any(output_satisfies_contract(task, text) for text in _step_texts(step)):
+                logger.info(f"Output for {name} meets its contract, finishing early")
+                self.early_stops.append(name)
+                force_final_answer(task.agent)
+        except Exception as e:
+            logger.warning(f"Scheduler step callback error (non-critical): {e}")
+
+    def on_task_complete(self, output):
+        """Task callback: record the finished task and re-split the remaining time"""
+        task = self.current_task()
+        previous_callback = self._previous_task_callbacks.get(id(task)) or getattr(self.crew, "task_callback", None)
+        if previous_callback:
+            previous_callback(output)
+        with self._lock:
+            if self.completed < len(self.tasks):
+                name = self._task_name(self.tasks[self.completed])
+                self.task_durations[name] = round(time.monotonic() - self._task_started, 2)
+            self.completed += 1
+            self._task_started = time.monotonic()
+        self._bind_current_agent()
+        self.allocate()
+
+    def start(self):
+        """Install callbacks on the crew, its tasks and agents and apply the initial allocation"""
+        self._previous_step_callback = self.crew.step_callback
+        self.crew.step_callback = self.on_step
+        # Set task callbacks directly: crewai never overwrites a task callback that is already set
+        for task in self.tasks:
+            self._previous_task_callbacks[id(task)] = task.callback
+            task.callback = self.on_task_complete
+        for agent in self.crew.agents:
+            self._previous_agent_callbacks[id(agent)] = agent.step_callback
+            agent.step_callback = self.on_step
+        self.crew.max_execution_time = max(1, int(self.deadline.remaining()))
+        self._task_started = time.monotonic()
+        self._bind_current_agent()
+        self.allocate()
+
+    def _bind_current_agent(self):
+        task = self.current_task()
+        bind_agent(getattr(getattr(task, "agent", None), "role", None))
+
+    def finish(self):
+        """Restore the crew's callbacks and default agent limits"""
+        self.crew.step_callback = self._previous_step_callback
+        for task in self.tasks:
+            task.callback = self._previous_task_callbacks.get(id(task))
+        for agent in self.crew.agents:
+            agent.step_callback = self._previous_agent_callbacks.get(id(agent))
+            agent.max_iter = AGENT_MAX_ITER
+            agent.max_execution_time = AGENT_MAX_EXECUTION_TIME
+
+    def summary(self):
+        """Return allocations and timings for the run record"""
+        return {
+            "deadline_seconds": self.deadline.total_seconds,
+            "elapsed_seconds": round(self.deadline.elapsed(), 2),
+            "allocations": self.allocations,
+            "task_durations": self.task_durations,
+            "early_stops": self.early_stops,
+            "deadline_stops": self.deadline_stops,
+        }
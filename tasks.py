@@ -10,6 +10,8 @@ def create_tasks(venue_coordinator, logistics_manager, marketing_communications_
             "The venue must accommodate {expected_participants} participants for {duration_hours} hours "
             "on {tentative_date}. Budget consideration: {budget}. "
             "Special requirements: {special_requirements}. "
+            "If the 'Search and rank venues' tool is available, start with it to get candidates "
+            "ranked for capacity, budget and requirements, then verify the best-ranked one.\n"
             "You MUST provide ONE specific venue with complete details including:\n"
             "- Exact venue name and address\n"
             "- Contact information (phone, email, website)\n"
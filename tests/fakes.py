@@ -0,0 +1,55 @@
+"""Stand-ins for crewai's Crew, Agent and Task, so the tests run without crewai"""
+from types import SimpleNamespace
+
+
+class FakeExecutor(SimpleNamespace):
+    """LangChain-style crewai executor with the forced-answer path"""
+
+    def __init__(self, iterations=0, max_iterations=5):
+        super().__init__(iterations=iterations, max_iterations=max_iterations,
+                         force_answer_max_iterations=max_iterations - 2, have_forced_answer=False)
+
+
+class FakeAgent:
+    def __init__(self, role, step_callback=None):
+        self.role = role
+        self.step_callback = step_callback
+        self.max_iter = 5
+        self.max_execution_time = 600
+        self.agent_executor = FakeExecutor()
+
+
+class FakeTask:
+    def __init__(self, output_file, agent, callback=None):
+        self.output_file = output_file
+        self.agent = agent
+        self.callback = callback
+
+
+class FakeCrew:
+    def __init__(self, agents, tasks, step_callback=None, task_callback=None, max_execution_time=None):
+        self.agents = agents
+        self.tasks = tasks
+        self.step_callback = step_callback
+        self.task_callback = task_callback
+        self.max_execution_time = max_execution_time
+
+    def kickoff(self):
+        """Copy the crew callbacks into unset agent and task slots, as crewai does"""
+        for agent in self.agents:
+            if agent.step_callback is None:
+                agent.step_callback = self.step_callback
+        for task in self.tasks:
+            if task.callback is None:
+                task.callback = self.task_callback
+        return "done"
+
+
+def make_crew(step_callback=None):
+    agents = [FakeAgent("Venue Coordinator"), FakeAgent("Logistics Manager"), FakeAgent("Marketing Agent")]
+    tasks = [
+        FakeTask("venue_details.json", agents[0]),
+        FakeTask("logistics_plan.md", agents[1]),
+        FakeTask("marketing_strategy.md", agents[2]),
+    ]
+    return FakeCrew(agents, tasks, step_callback=step_callback)
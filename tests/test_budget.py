@@ -0,0 +1,135 @@
+import logging
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+import budget
+from budget import (
+    RunBudget,
+    TokenUsageCallbackHandler,
+    attach_run_budget,
+    extract_token_usage,
+    force_final_answer,
+)
+
+
+def openai_result(prompt_tokens, completion_tokens):
+    return LLMResult(
+        generations=[[ChatGeneration(message=AIMessage(content="ok"))]],
+        llm_output={"token_usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}},
+    )
+
+
+def gemini_result(input_tokens, output_tokens):
+    message = AIMessage(content="ok", usage_metadata={
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    })
+    return LLMResult(generations=[[ChatGeneration(message=message)]], llm_output={})
+
+
+def langchain_executor(iterations, max_iterations=15):
+    return SimpleNamespace(iterations=iterations, max_iterations=max_iterations,
+                           force_answer_max_iterations=max_iterations - 2, have_forced_answer=False)
+
+
+def test_extract_token_usage_openai_shape():
+    assert extract_token_usage(openai_result(120, 30)) == (120, 30)
+
+
+def test_extract_token_usage_gemini_shape():
+    assert extract_token_usage(gemini_result(80, 20)) == (80, 20)
+
+
+def test_agent_token_budget_is_enforced():
+    run_budget = RunBudget("run", run_token_budget=0, agent_token_budget=100, run_cost_budget=0, agent_cost_budget=0)
+    assert not run_budget.record("Planner", "gpt-4o", 50, 10)
+    assert run_budget.record("Planner", "gpt-4o", 30, 10)
+    assert run_budget.is_exhausted("Planner")
+    assert not run_budget.is_exhausted("Writer")
+
+
+def test_run_budget_spans_agents():
+    run_budget = RunBudget("run", run_token_budget=100, agent_token_budget=0, run_cost_budget=0, agent_cost_budget=0)
+    assert not run_budget.record("Planner", "gpt-4o", 60, 0)
+    assert run_budget.record("Writer", "gpt-4o", 40, 0)
+    assert run_budget.summary()["exhausted_agents"] == ["Writer"]
+
+
+def test_cost_budget_uses_model_pricing():
+    run_budget = RunBudget("run", run_token_budget=0, agent_token_budget=0, run_cost_budget=0.01, agent_cost_budget=0)
+    # gpt-4o: $2.50 per 1M input tokens
+    assert not run_budget.record("Planner", "gpt-4o", 3000, 0)
+    assert run_budget.record("Planner", "gpt-4o", 1000, 0)
+    assert run_budget.summary()["totals"]["cost_usd"] == 0.01
+
+
+def test_unpriced_models_warn_once_and_are_listed(caplog, monkeypatch):
+    monkeypatch.setattr(budget, "_warned_unpriced_models", set())
+    run_budget = RunBudget("run")
+    with caplog.at_level(logging.WARNING, logger="budget"):
+        run_budget.record("Planner", "mystery-model", 10, 10)
+        run_budget.record("Planner", "mystery-model", 10, 10)
+    assert sum("mystery-model" in record.getMessage() for record in caplog.records) == 1
+    summary = run_budget.summary()
+    assert summary["unpriced_models"] == ["mystery-model"]
+    assert summary["totals"]["cost_usd"] == 0.0
+
+
+def test_force_final_answer_uses_the_forced_answer_path():
+    executor = langchain_executor(iterations=4)
+    force_final_answer(SimpleNamespace(role="Planner", agent_executor=executor))
+    assert executor.force_answer_max_iterations == 5
+    assert executor.max_iterations == 15
+
+
+def test_force_final_answer_leaves_room_for_the_answer():
+    executor = langchain_executor(iterations=4, max_iterations=6)
+    force_final_answer(SimpleNamespace(role="Planner", agent_executor=executor))
+    assert executor.force_answer_max_iterations == 5
+    assert executor.max_iterations == 7
+
+
+def test_force_final_answer_does_not_force_twice():
+    executor = langchain_executor(iterations=4)
+    executor.have_forced_answer = True
+    force_final_answer(SimpleNamespace(role="Planner", agent_executor=executor))
+    assert executor.force_answer_max_iterations == 13
+
+
+def test_force_final_answer_on_executors_without_forced_answer_path():
+    executor = SimpleNamespace(iterations=3, max_iter=25)
+    force_final_answer(SimpleNamespace(role="Planner", agent_executor=executor))
+    assert executor.max_iter == 4
+    force_final_answer(SimpleNamespace(role="Planner"))
+
+
+def test_callback_handler_records_usage_and_forces_exhausted_agent():
+    handler = TokenUsageCallbackHandler("Planner", "gpt-4o")
+    executor = langchain_executor(iterations=2)
+    agent = SimpleNamespace(role="Planner", llm=SimpleNamespace(callbacks=[handler]), agent_executor=executor)
+    run_budget = RunBudget("run", run_token_budget=0, agent_token_budget=100, run_cost_budget=0, agent_cost_budget=0)
+    attach_run_budget([agent], run_budget)
+
+    handler.on_llm_end(openai_result(40, 10))
+    assert run_budget.summary()["agents"]["Planner"]["total_tokens"] == 50
+    assert executor.force_answer_max_iterations == 13
+
+    handler.on_llm_end(gemini_result(40, 20))
+    assert run_budget.summary()["totals"]["total_tokens"] == 110
+    assert executor.force_answer_max_iterations == 3
+
+
+def test_detached_handler_records_nothing():
+    handler = TokenUsageCallbackHandler("Planner", "gpt-4o")
+    agent = SimpleNamespace(role="Planner", llm=SimpleNamespace(callbacks=[handler]))
+    run_budget = RunBudget("run")
+    attach_run_budget([agent], run_budget)
+    attach_run_budget([agent], None)
+    handler.on_llm_end(openai_result(40, 10))
+    assert run_budget.summary()["totals"]["calls"] == 0
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+from contracts import _parse_json_object, output_satisfies_contract
+
+VENUE = SimpleNamespace(output_file="venue_details.json")
+LOGISTICS = SimpleNamespace(output_file="logistics_plan.md")
+
+VENUE_JSON = (
+    '{"name": "Hall A", "address": "1 Main St", "capacity": 500, "booking_status": "available", '
+    '"price_range": "$5,000", "amenities": ["wifi"], "contact_info": "hall@example.com"}'
+)
+
+
+def test_json_contract_needs_every_field():
+    assert output_satisfies_contract(VENUE, f"Final Answer: {VENUE_JSON}")
+    assert not output_satisfies_contract(VENUE, '{"name": "Hall A", "address": ""}')
+
+
+def test_json_contract_accepts_single_quoted_json():
+    assert output_satisfies_contract(VENUE, VENUE_JSON.replace('"', "'"))
+
+
+def test_unparseable_json_is_rejected_without_raising():
+    assert _parse_json_object("{[1]: 2}") is None
+    assert _parse_json_object("{" * 200 + "}" * 200) is None
+    assert _parse_json_object("no braces here") is None
+
+
+def test_markdown_contract_needs_one_heading_per_section():
+    plan = "# Catering\n...\n## Equipment\n...\n**Timeline**: day 1\n### Cost estimate\n..."
+    assert output_satisfies_contract(LOGISTICS, plan)
+    assert not output_satisfies_contract(LOGISTICS, "# Catering, equipment, timeline and cost\n...")
+    assert not output_satisfies_contract(LOGISTICS, "# Catering\n# Equipment\n# Timeline\n")
+
+
+def test_tasks_without_a_contract_never_match():
+    assert not output_satisfies_contract(SimpleNamespace(output_file="notes.txt"), VENUE_JSON)
+    assert not output_satisfies_contract(VENUE, "")
@@ -0,0 +1,99 @@
+import threading
+import time
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from crew_pool import CrewPool, reset_crew, set_output_dir
+from fakes import make_crew
+from scheduler import DeadlineScheduler, RunDeadline
+
+
+def built_step_callback(step):
+    pass
+
+
+def build_crew():
+    return make_crew(step_callback=built_step_callback)
+
+
+def test_released_crew_is_reused_without_the_previous_run_callbacks():
+    pool = CrewPool(factory=build_crew, size=1)
+    with pool.checkout() as crew:
+        scheduler = DeadlineScheduler(crew, RunDeadline(600))
+        scheduler.start()
+        crew.task_callback = print
+        crew.kickoff()
+        crew.step_callback = print
+
+    with pool.checkout() as reused:
+        assert reused is crew
+        assert reused.step_callback is built_step_callback
+        assert reused.task_callback is None
+        assert all(agent.step_callback is None for agent in reused.agents)
+        assert all(task.callback is None for task in reused.tasks)
+        reused.kickoff()
+        assert all(agent.step_callback is built_step_callback for agent in reused.agents)
+    assert pool.stats()["created"] == 1
+
+
+def test_output_dir_is_set_per_run_and_reset(tmp_path):
+    crew = build_crew()
+    set_output_dir(crew, str(tmp_path / "run1"))
+    assert crew.tasks[0].output_file == str(tmp_path / "run1" / "venue_details.json")
+    reset_crew(crew, built_step_callback)
+    assert [task.output_file for task in crew.tasks] == [
+        "venue_details.json", "logistics_plan.md", "marketing_strategy.md"
+    ]
+
+
+def test_discarded_crew_wakes_a_waiting_checkout():
+    pool = CrewPool(factory=build_crew, size=1)
+    crew = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.1)
+
+    crew.tasks = None  # reset_crew fails, so the crew is discarded
+    started = time.monotonic()
+    pool.release(crew)
+    waiter.join(5)
+
+    assert acquired and acquired[0] is not crew
+    assert time.monotonic() - started < 2
+    stats = pool.stats()
+    assert stats["discarded"] == 1 and stats["created"] == 1
+
+
+def test_failed_build_frees_its_slot():
+    attempts = []
+
+    def flaky_factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("LLM client unavailable")
+        return build_crew()
+
+    pool = CrewPool(factory=flaky_factory, size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire(timeout=0.1)
+    assert pool.acquire(timeout=0.1) is not None
+    assert pool.stats()["created"] == 1
+
+
+def test_checkout_times_out_when_every_crew_is_in_use():
+    pool = CrewPool(factory=build_crew, size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+
+def test_warm_up_builds_idle_crews_up_to_the_pool_size():
+    pool = CrewPool(factory=build_crew, size=2)
+    pool.warm_up(count=3)
+    stats = pool.stats()
+    assert stats["created"] == 2 and stats["idle"] == 2
+    assert stats["warm_up_seconds"] is not None
+    pool.acquire(timeout=0.1)
+    assert pool.stats()["idle"] == 1
@@ -0,0 +1,94 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("httpx")
+
+import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"x" * 1024
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def session():
+    session = requests.Session()
+    session.mount("http://", http_client.PooledHTTPAdapter(pool_maxsize=2, pool_block=True))
+    yield session
+    session.close()
+
+
+def test_connection_slot_is_held_until_the_body_is_consumed(monkeypatch, server, session):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(http_client, "_connection_slots", slots)
+
+    response = session.get(server, stream=True)
+    assert not slots.acquire(blocking=False)
+    response.close()
+    assert slots.acquire(blocking=False)
+    slots.release()
+
+    assert session.get(server).content == b"x" * 1024
+    assert slots.acquire(blocking=False)
+
+
+def test_connections_are_reused(server, session):
+    before = http_client.get_pool_stats().get("requests", {}).get("new_connections", 0)
+    for _ in range(3):
+        session.get(server).raise_for_status()
+    assert http_client.get_pool_stats()["requests"]["new_connections"] - before == 1
+
+
+def test_dns_cache_expires_and_evicts_entries(monkeypatch):
+    now = [1000.0]
+    lookups = []
+    monkeypatch.setattr(http_client.time, "time", lambda: now[0])
+    monkeypatch.setattr(http_client, "_original_getaddrinfo", lambda host, port: lookups.append(host) or [(host, port)])
+    monkeypatch.setattr(http_client, "DNS_CACHE_TTL", 60)
+    monkeypatch.setattr(http_client, "DNS_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(http_client, "_dns_cache", {})
+
+    http_client._cached_getaddrinfo("a.example", 443)
+    http_client._cached_getaddrinfo("a.example", 443)
+    assert lookups == ["a.example"]
+
+    now[0] += 61
+    http_client._cached_getaddrinfo("b.example", 443)
+    assert list(http_client._dns_cache) == [(("b.example", 443), ())]
+
+    http_client._cached_getaddrinfo("c.example", 443)
+    http_client._cached_getaddrinfo("d.example", 443)
+    assert len(http_client._dns_cache) == 2
+    assert (("b.example", 443), ()) not in http_client._dns_cache
+
+
+def test_pool_stats_snapshot():
+    stats = http_client.PoolStats()
+    for _ in range(4):
+        stats.record_request("client")
+    stats.record_new_connection("client")
+    stats.record_wait("client", 0.02)
+    snapshot = stats.snapshot()["client"]
+    assert snapshot["reuse_ratio"] == 0.75
+    assert snapshot["avg_wait_ms"] == 5.0
+    assert snapshot["max_wait_ms"] == 20.0
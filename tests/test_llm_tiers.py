@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from budget import RunBudget, TokenUsageCallbackHandler, attach_run_budget
+from config import load_llm_tier_config
+from llm_tiers import TieredChatModel
+
+PROMPT = [HumanMessage(content="Find a venue")]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replies with a fixed text, cut at the stop sequences like a real API"""
+
+    reply: str
+    stops: list = Field(default_factory=list)
+
+    @property
+    def _llm_type(self):
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.stops.append(stop)
+        text = self.reply
+        for marker in stop or []:
+            text = text.split(marker)[0]
+        message = AIMessage(content=text, usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def tiered(fast_reply, strong_reply="Final Answer: the strong answer"):
+    fast = ScriptedChatModel(reply=fast_reply, callbacks=[TokenUsageCallbackHandler("Planner", "fast-model", "fast")])
+    strong = ScriptedChatModel(reply=strong_reply, callbacks=[TokenUsageCallbackHandler("Planner", "strong-model", "strong")])
+    return TieredChatModel(fast_llm=fast, strong_llm=strong, agent_role="Planner")
+
+
+def test_action_step_stays_on_the_fast_model():
+    model = tiered("Thought: search first\nAction: Search\nAction Input: venues")
+    result = model.invoke(PROMPT, stop=["\nObservation"])
+    assert "Action: Search" in result.content
+    assert model.fast_llm.stops == [["\nObservation", "Final Answer:"]]
+    assert model.strong_llm.stops == []
+
+
+def test_final_answer_is_generated_only_by_the_strong_model():
+    model = tiered("Thought: I know enough\nFinal Answer: a fast answer")
+    result = model.invoke(PROMPT, stop=["\nObservation"])
+    assert result.content == "Final Answer: the strong answer"
+    assert model.fast_llm.stops == [["\nObservation", "Final Answer:"]]
+    assert model.strong_llm.stops == [["\nObservation"]]
+
+
+def test_usage_is_reported_per_tier():
+    model = tiered("Thought: I know enough\nFinal Answer: a fast answer")
+    run_budget = RunBudget("run")
+    attach_run_budget([SimpleNamespace(role="Planner", llm=model)], run_budget)
+    model.invoke(PROMPT)
+    tiers = run_budget.summary()["tiers"]
+    assert tiers["fast"]["calls"] == 1 and tiers["fast"]["models"] == ["fast-model"]
+    assert tiers["strong"]["calls"] == 1 and tiers["strong"]["models"] == ["strong-model"]
+    assert run_budget.summary()["agents"]["Planner"]["total_tokens"] == 30
+
+
+def test_invalid_default_entry_is_replaced(monkeypatch):
+    monkeypatch.setenv("AGENT_LLM_CONFIG", '{"default": "strong"}')
+    monkeypatch.delenv("LLM_TIERS", raising=False)
+    config = load_llm_tier_config()
+    assert config["agents"]["default"] == {"tool_phase": "fast", "final_phase": "fast"}
+
+
+def test_agent_entries_are_validated(monkeypatch):
+    monkeypatch.setenv("AGENT_LLM_CONFIG", '{"Planner": {"final_phase": "strong"}, "Writer": {"tool_phase": "huge"}}')
+    monkeypatch.setenv("LLM_TIERS", '{"strong": {"openai": "gpt-4o"}, "broken": {}}')
+    config = load_llm_tier_config()
+    assert set(config["tiers"]) == {"fast", "strong"}
+    assert config["agents"]["Planner"] == {"tool_phase": "fast", "final_phase": "strong"}
+    assert config["agents"]["Writer"] == {"tool_phase": "fast", "final_phase": "fast"}
+    assert "default" in config["agents"]
@@ -0,0 +1,97 @@
+import contextvars
+import json
+import logging
+import queue
+import pytest
+
+import log_pipeline
+from log_pipeline import (
+    ContextFilter,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    bind_agent,
+    bind_run,
+    parse_sample_rates,
+)
+
+
+def make_record(message, level=logging.INFO, args=None):
+    return logging.LogRecord("event", level, __file__, 1, message, args, None)
+
+
+def in_run(run_id, agent_role, function):
+    """Call function with run_id and agent_role bound in a fresh context"""
+    def bound():
+        bind_run(run_id)
+        bind_agent(agent_role)
+        return function()
+    return contextvars.copy_context().run(bound)
+
+
+def test_records_carry_the_bound_run_and_agent():
+    record = make_record("hello")
+    in_run("run-1", "Venue Coordinator", lambda: ContextFilter().filter(record))
+    assert (record.run_id, record.agent_role) == ("run-1", "Venue Coordinator")
+
+    other = make_record("outside")
+    ContextFilter().filter(other)
+    assert other.run_id is None
+
+
+def test_json_formatter_writes_one_object_per_record():
+    record = make_record("found %d venues", args=(3,))
+    in_run("run-1", "Venue Coordinator", lambda: ContextFilter().filter(record))
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "found 3 venues"
+    assert entry["run_id"] == "run-1" and entry["agent_role"] == "Venue Coordinator"
+    assert entry["level"] == "INFO" and entry["logger"] == "event"
+
+
+def test_handler_truncates_long_messages():
+    handler = NonBlockingQueueHandler(queue.Queue(), max_message_chars=10)
+    prepared = handler.prepare(make_record("x" * 25))
+    assert prepared.getMessage() == "x" * 10 + "... [truncated 15 chars]"
+
+
+def test_handler_drops_and_counts_records_when_the_queue_is_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1), max_message_chars=0)
+    for _ in range(3):
+        handler.handle(make_record("step"))
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_parse_sample_rates_skips_invalid_entries():
+    rates = parse_sample_rates("DEBUG=0.1, info=2, BOGUS=0.5, WARNING=often, ERROR")
+    assert rates == {logging.DEBUG: 0.1, logging.INFO: 1.0}
+    assert parse_sample_rates("") == {}
+
+
+def test_sampling_filter_only_thins_listed_levels():
+    sampler = SamplingFilter({logging.DEBUG: 0.0})
+    assert not sampler.filter(make_record("noise", logging.DEBUG))
+    assert sampler.filter(make_record("signal", logging.INFO))
+
+
+def test_prefetch_threads_keep_the_callers_log_context(monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("bs4")
+    import web
+
+    seen = []
+
+    def fetch(url, headers=None, cookies=None):
+        seen.append((log_pipeline._run_id.get(), log_pipeline._agent_role.get()))
+        return False, ""
+    monkeypatch.setattr(web, "fetch_page_text", fetch)
+
+    url = "https://context.example.com"
+
+    def prefetch():
+        web.prefetch_pages([url])
+        return web._scrape_inflight.get(url)
+    future = in_run("run-7", "Logistics Manager", prefetch)
+    if future is not None:
+        future.result(timeout=5)
+    assert seen == [("run-7", "Logistics Manager")]
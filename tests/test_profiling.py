@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+import time
+
+from fakes import make_crew
+from profiling import RunProfiler
+
+
+def spin(seconds):
+    """Keep the CPU busy for a while"""
+    until = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < until:
+        total += sum(range(200))
+    return total
+
+
+def local_frames(summary, phase):
+    return [frame for frame, _ in summary["phases"][phase]["samples"]["top_local_frames"]]
+
+
+def test_phases_are_written_to_summary_json(tmp_path):
+    profiler = RunProfiler(output_dir=str(tmp_path), sample_interval=0.005)
+    profiler.start()
+    with profiler.phase("display_results"):
+        spin(0.1)
+    summary = profiler.finish()
+
+    with open(os.path.join(profiler.output_dir, "summary.json")) as f:
+        written = json.load(f)
+    phase = written["phases"]["display_results"]
+    assert phase["wall_seconds"] >= 0.1 and phase["cpu_seconds"] > 0
+    assert os.path.exists(phase["profile_file"])
+    assert "peak_memory_mb" in phase
+    assert summary["session_id"] == written["session_id"]
+
+
+def test_attach_switches_phases_on_task_completion(tmp_path):
+    crew = make_crew()
+    for task in crew.tasks:
+        task.output_file = os.path.join("outputs", "run1", task.output_file)
+    finished = []
+    crew.tasks[0].callback = finished.append
+
+    profiler = RunProfiler(output_dir=str(tmp_path), sample_interval=0.005)
+    profiler.start()
+    profiler.attach(crew, "attempt1:")
+    assert profiler.current_phase == "attempt1:task:venue_details.json"
+    crew.tasks[0].callback("venue done")
+    assert finished == ["venue done"]
+    assert profiler.current_phase == "attempt1:task:logistics_plan.md"
+    crew.tasks[1].callback("logistics done")
+    crew.tasks[2].callback("marketing done")
+    assert profiler.current_phase is None
+    summary = profiler.finish()
+    assert set(summary["phases"]) >= {
+        "attempt1:task:venue_details.json",
+        "attempt1:task:logistics_plan.md",
+        "attempt1:task:marketing_strategy.md",
+    }
+
+
+def test_sampler_only_counts_the_thread_running_the_phase(tmp_path):
+    profiler = RunProfiler(output_dir=str(tmp_path), sample_interval=0.005)
+    profiler.start()
+
+    def crew_worker():
+        with profiler.phase("task"):
+            spin(0.3)
+
+    worker = threading.Thread(target=crew_worker)
+    worker.start()
+    # The main thread waits in a join loop, as main.py does while the crew runs
+    while worker.is_alive():
+        worker.join(timeout=0.01)
+
+    with profiler.phase("display_results"):
+        spin(0.2)
+    summary = profiler.finish()
+
+    assert local_frames(summary, "task")
+    assert all(frame.endswith(("crew_worker", "spin")) for frame in local_frames(summary, "task"))
+    assert any(frame.endswith("spin") for frame in local_frames(summary, "display_results"))
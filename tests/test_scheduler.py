@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from fakes import make_crew
+from scheduler import DeadlineScheduler, RunDeadline
+
+VENUE_JSON = (
+    '{"name": "Hall A", "address": "1 Main St", "capacity": 500, "booking_status": "available", '
+    '"price_range": "$5,000", "amenities": ["wifi"], "contact_info": "hall@example.com"}'
+)
+
+
+def step(text):
+    return SimpleNamespace(log=text)
+
+
+def test_slices_never_exceed_the_remaining_deadline():
+    crew = make_crew()
+    scheduler = DeadlineScheduler(crew, RunDeadline(30))
+    scheduler.start()
+    assert sum(allocation["seconds"] for allocation in scheduler.allocations.values()) <= 30
+    assert crew.max_execution_time <= 30
+    assert all(agent.max_execution_time >= 1 for agent in crew.agents)
+
+
+def test_slices_follow_task_weights_with_enough_time():
+    crew = make_crew()
+    scheduler = DeadlineScheduler(crew, RunDeadline(3200))
+    scheduler.start()
+    seconds = [scheduler.allocations[task.output_file]["seconds"] for task in crew.tasks]
+    assert sum(seconds) <= 3200
+    assert seconds[1] > seconds[0]
+    assert crew.agents[1].max_iter == 5
+
+
+def test_expired_deadline_forces_the_active_agent():
+    crew = make_crew()
+    scheduler = DeadlineScheduler(crew, RunDeadline(0))
+    scheduler.start()
+    assert all(allocation["seconds"] == 0 for allocation in scheduler.allocations.values())
+    assert crew.max_execution_time == 1
+
+    executor = crew.agents[0].agent_executor
+    executor.iterations = 1
+    scheduler.on_step(step("Thought: still searching"))
+    assert executor.force_answer_max_iterations == 2
+    assert scheduler.deadline_stops == ["venue_details.json"]
+
+    # Further steps do not force the same task again
+    scheduler.on_step(step("Thought: still searching"))
+    assert scheduler.deadline_stops == ["venue_details.json"]
+
+
+def test_contract_met_forces_final_answer_once():
+    crew = make_crew()
+    scheduler = DeadlineScheduler(crew, RunDeadline(600))
+    scheduler.start()
+    executor = crew.agents[0].agent_executor
+    executor.iterations = 2
+    scheduler.on_step(step(f"Thought: I have it\n{VENUE_JSON}"))
+    scheduler.on_step(step(f"Thought: I have it\n{VENUE_JSON}"))
+    assert scheduler.early_stops == ["venue_details.json"]
+    assert executor.force_answer_max_iterations == 3
+
+
+def test_task_completion_resplits_and_finish_restores_callbacks():
+    seen = []
+    crew = make_crew(step_callback=seen.append)
+    scheduler = DeadlineScheduler(crew, RunDeadline(600))
+    scheduler.start()
+    assert all(agent.step_callback == scheduler.on_step for agent in crew.agents)
+    assert all(task.callback == scheduler.on_task_complete for task in crew.tasks)
+
+    scheduler.on_step(step("Thought: working"))
+    scheduler.on_task_complete("venue done")
+    assert scheduler.current_task() is crew.tasks[1]
+    assert "venue_details.json" in scheduler.task_durations
+
+    scheduler.finish()
+    assert crew.step_callback == seen.append
+    assert all(agent.step_callback is None for agent in crew.agents)
+    assert all(task.callback is None for task in crew.tasks)
+    assert len(seen) == 1
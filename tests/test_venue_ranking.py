@@ -0,0 +1,67 @@
+import pytest
+
+from venue_ranking import (
+    build_sub_queries,
+    capacity_band,
+    merge_candidates,
+    parse_budget,
+    rank_candidates,
+    requirement_keywords,
+)
+
+
+@pytest.mark.parametrize("budget, amount", [
+    ("$5000", 5000),
+    ("$5,000.00", 5000),
+    ("$5000-$8000", 5000),
+    ("5k", 5000),
+    ("$7.5K USD", 7500),
+    ("around 1.2m", 1200000),
+    ("5000 for 3 months", 5000),
+    ("not specified", None),
+    ("", None),
+])
+def test_parse_budget(budget, amount):
+    assert parse_budget(budget) == amount
+
+
+@pytest.mark.parametrize("participants, band", [(5, "5-10"), (100, "90-150"), (250, "220-380")])
+def test_capacity_band_contains_the_participants(participants, band):
+    assert capacity_band(participants) == band
+    lower, upper = map(int, band.split("-"))
+    assert lower <= participants < upper
+
+
+def test_requirement_sub_search_only_with_real_requirements():
+    facets = [query["facet"] for query in build_sub_queries("Berlin", 100, "None specified")]
+    assert "requirements" not in facets and "capacity:90-150" in facets
+    assert requirement_keywords("Needs wheelchair access and parking") == ["wheelchair", "access", "parking"]
+    assert "requirements" in [query["facet"] for query in build_sub_queries("Berlin", 100, "wheelchair access")]
+
+
+def test_merge_candidates_counts_the_facets_that_found_each_venue():
+    results = [
+        ("type:hotel", [{"title": "Grand Hall", "link": "https://www.grandhall.com/events", "snippet": ""}]),
+        ("district:downtown", [
+            {"title": "Grand Hall", "link": "https://grandhall.com/", "snippet": ""},
+            {"title": "No link"},
+        ]),
+    ]
+    candidates = merge_candidates(results)
+    assert len(candidates) == 1
+    assert candidates[0]["facets"] == ["type:hotel", "district:downtown"]
+
+
+def test_rank_candidates_prefers_venues_that_fit():
+    candidates = [
+        {"name": "Tiny Room", "link": "https://a.example", "snippet": "Seats 20 guests from $1,000",
+         "facets": ["type:hotel"]},
+        {"name": "Right Size Hall", "link": "https://b.example", "snippet": "Up to 150 guests, wheelchair access, from $4,000",
+         "facets": ["type:hotel", "capacity:90-150"]},
+        {"name": "Pricey Arena", "link": "https://c.example", "snippet": "Holds 5000 people, from $90,000",
+         "facets": ["type:hotel"]},
+    ]
+    ranked = rank_candidates(candidates, 120, "$5,000.00", "wheelchair access", facet_count=2)
+    assert [candidate["name"] for candidate in ranked][0] == "Right Size Hall"
+    assert ranked[0]["estimated_capacity"] == 150 and ranked[0]["estimated_price"] == 4000
+    assert all(0 <= candidate["score"] <= 1 for candidate in ranked)
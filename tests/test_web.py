@@ -0,0 +1,115 @@
+import threading
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+import web
+
+URL = "https://venue.example.com"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    web._scrape_cache.clear()
+    web._scrape_inflight.clear()
+    yield
+    web._scrape_cache.clear()
+    web._scrape_inflight.clear()
+
+
+def fake_fetch(responses):
+    """Return a fetch_page_text replacement that serves (ok, text) pairs and counts calls"""
+    calls = []
+
+    def fetch(url, headers=None, cookies=None):
+        calls.append(url)
+        return responses[min(len(calls), len(responses)) - 1]
+    return fetch, calls
+
+
+def test_cached_page_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(web.time, "time", lambda: now[0])
+    monkeypatch.setattr(web, "SCRAPE_CACHE_TTL", 60)
+    web.store_cached_page(URL, "page")
+    now[0] += 59
+    assert web.get_cached_page(URL) == "page"
+    now[0] += 2
+    assert web.get_cached_page(URL) is None
+    assert URL not in web._scrape_cache
+
+
+def test_oldest_page_is_evicted_when_full(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(web.time, "time", lambda: now[0])
+    monkeypatch.setattr(web, "SCRAPE_CACHE_MAX_ENTRIES", 2)
+    for url in ("a", "b", "c"):
+        web.store_cached_page(url, url.upper())
+        now[0] += 1
+    assert web.get_cached_page("a") is None
+    assert web.get_cached_page("b") == "B"
+    assert web.get_cached_page("c") == "C"
+
+
+def test_error_pages_are_returned_but_not_cached(monkeypatch):
+    fetch, calls = fake_fetch([(False, "503 Service Unavailable"), (True, "Grand Hall")])
+    monkeypatch.setattr(web, "fetch_page_text", fetch)
+    assert web.scrape_page(URL) == "503 Service Unavailable"
+    assert web.get_cached_page(URL) is None
+    assert web.scrape_page(URL) == "Grand Hall"
+    assert web.scrape_page(URL) == "Grand Hall"
+    assert len(calls) == 2
+
+
+def test_prefetch_does_not_cache_error_pages(monkeypatch):
+    fetch, _ = fake_fetch([(False, "404 Not Found")])
+    monkeypatch.setattr(web, "fetch_page_text", fetch)
+    web.prefetch_pages([URL])
+    for future in list(web._scrape_inflight.values()):
+        future.result(timeout=5)
+    assert web.get_cached_page(URL) is None
+
+
+def test_scrape_waits_for_inflight_prefetch(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(url, headers=None, cookies=None):
+        calls.append(url)
+        release.wait(5)
+        return True, "Grand Hall"
+
+    monkeypatch.setattr(web, "fetch_page_text", slow_fetch)
+    web.prefetch_pages([URL])
+    result = []
+    scraper = threading.Thread(target=lambda: result.append(web.scrape_page(URL)))
+    scraper.start()
+    release.set()
+    scraper.join(timeout=5)
+    assert result == ["Grand Hall"]
+    assert calls == [URL]
+
+
+def test_batch_search_reports_queries_it_did_not_run(monkeypatch):
+    sent = []
+
+    def fake_search(queries, api_key, n_results):
+        sent.append(list(queries))
+        # Answer one result short to simulate a truncated batch response
+        return [{"organic": [{"title": f"T {query}", "link": f"https://{index}.example.com"}]}
+                for index, query in enumerate(queries[:-1])]
+
+    monkeypatch.setattr(web, "serper_search", fake_search)
+    monkeypatch.setattr(web, "prefetch_pages", lambda urls: None)
+    monkeypatch.setattr(web, "SEARCH_BATCH_MAX_QUERIES", 3)
+    text = web.batch_search("q1; q2; q3; q4; q5", api_key="key")
+
+    assert sent == [["q1", "q2", "q3"]]
+    assert "Search results for: q1" in text and "Search results for: q2" in text
+    assert "No results returned for: q3" in text
+    assert "send these again): q4; q5" in text
+
+
+def test_batch_search_without_queries():
+    assert web.batch_search(" ; ") == "No search query provided."
@@ -1,9 +1,56 @@
 from crewai_tools import ScrapeWebsiteTool, SerperDevTool
-from config import SERPER_API_KEY
+from pydantic import BaseModel, Field
+from typing import Type
+from config import (
+    SERPER_API_KEY,
+    SEARCH_BATCH_MODE,
+    PREFETCH_TOP_K,
+)
+from web import scrape_page, batch_search
 import logging
 
+try:
+    from crewai.tools import BaseTool
+except ImportError:  # Older crewai_tools releases ship BaseTool themselves
+    from crewai_tools import BaseTool
+
 logger = logging.getLogger(__name__)
 
+class CachedScrapeWebsiteTool(ScrapeWebsiteTool):
+    """Scrape tool that serves pages from the shared cache before hitting the network"""
+
+    def _run(self, **kwargs):
+        website_url = kwargs.get('website_url', getattr(self, 'website_url', None))
+        if not website_url:
+            return super()._run(**kwargs)
+        return scrape_page(
+            website_url,
+            headers=getattr(self, 'headers', None),
+            cookies=getattr(self, 'cookies', None)
+        )
+
+class BatchSearchSchema(BaseModel):
+    """Input for BatchSerperSearchTool"""
+    search_query: str = Field(
+        ...,
+        description="One or more search queries separated by ';' (e.g. 'venues in Austin; conference halls Austin')"
+    )
+
+class BatchSerperSearchTool(BaseTool):
+    """Serper search tool that sends several queries in one request and prefetches top results"""
+    name: str = "Search the internet"
+    description: str = (
+        "Search the internet with one or more queries. Separate multiple queries with ';' "
+        "to run them together in a single request. Returns titles, links and snippets."
+    )
+    args_schema: Type[BaseModel] = BatchSearchSchema
+    api_key: str = ""
+    n_results: int = 5
+    prefetch_top_k: int = PREFETCH_TOP_K
+
+    def _run(self, search_query: str = "", **kwargs):
+        return batch_search(search_query, self.api_key, self.n_results, self.prefetch_top_k)
+
 # Initialize the tools with error handling
 def initialize_search_tool():
     """Initialize search tool with proper error handling"""
@@ -11,7 +58,16 @@ def initialize_search_tool():
         if not SERPER_API_KEY:
             logger.warning("SERPER_API_KEY not found, using default configuration")
             return SerperDevTool()
-        
+
+        if SEARCH_BATCH_MODE:
+            search_tool = BatchSerperSearchTool(
+                api_key=SERPER_API_KEY,
+                n_results=5,  # Limit results to avoid overwhelming the agents
+                prefetch_top_k=PREFETCH_TOP_K
+            )
+            logger.info("Batch search tool initialized successfully with API key")
+            return search_tool
+
         search_tool = SerperDevTool(
             api_key=SERPER_API_KEY,
             n_results=5,  # Limit results to avoid overwhelming the agents
@@ -27,7 +83,7 @@ def initialize_search_tool():
 def initialize_scrape_tool():
     """Initialize scrape tool with proper error handling"""
     try:
-        scrape_tool = ScrapeWebsiteTool(
+        scrape_tool = CachedScrapeWebsiteTool(
             timeout=30,  # 30 second timeout
             wait_time=3  # Wait 3 seconds for page load
         )
@@ -38,6 +94,9 @@ def initialize_scrape_tool():
         logger.info("Falling back to default scrape tool configuration")
         return ScrapeWebsiteTool()
 
-# Initialize tools
-search_tool = initialize_search_tool()
-scrape_tool = initialize_scrape_tool()
\ No newline at end of file
+def create_tools():
+    """Create a fresh pair of search and scrape tool handles for one crew
+
+    The scrape cache and HTTP connection pool stay shared between all handles.
+    """
+    return [initialize_search_tool(), initialize_scrape_tool()]
\ No newline at end of file
@@ -0,0 +1,161 @@
+from urllib.parse import urlparse
+import re
+
+VENUE_TYPES = [
+    "conference center",
+    "hotel event space",
+    "banquet hall",
+    "coworking event space",
+    "university event venue",
+]
+DISTRICTS = ["downtown", "city center", "business district"]
+
+# Scoring weights for the local ranking
+SCORE_WEIGHTS = {
+    "capacity": 0.4,
+    "budget": 0.3,
+    "requirements": 0.2,
+    "corroboration": 0.1,
+}
+
+CAPACITY_PATTERN = re.compile(
+    r"(?:up to|capacity(?: of)?|accommodates?|seats?|holds?)\s*(\d{2,5})"
+    r"|(\d{2,5})\s*\+?\s*(?:guests|people|attendees|seats|persons|pax|seated|standing)",
+    re.IGNORECASE
+)
+PRICE_PATTERN = re.compile(r"\$\s?(\d[\d,]*)")
+# First amount of a budget, with an optional thousands or millions suffix ('5k', '1.5m')
+BUDGET_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(?:([km])(?![a-z]))?", re.IGNORECASE)
+BUDGET_MULTIPLIERS = {"k": 1000, "m": 1000000}
+STOPWORDS = {"none", "specified", "with", "and", "for", "the", "need", "needs", "must", "have", "should"}
+
+def parse_budget(budget):
+    """Turn a budget like '$5,000.00', '$5k' or '$5000-$8000' into a whole amount, or None
+
+    Only the first amount counts, so a range gives its lower bound.
+    """
+    match = BUDGET_PATTERN.search(str(budget))
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", ""))
+    return int(amount * BUDGET_MULTIPLIERS.get((match.group(2) or "").lower(), 1))
+
+def capacity_band(participants):
+    """Return a human-friendly capacity band around the expected participants"""
+    lower = min(participants, max(10, int(participants * 0.9) // 10 * 10))
+    upper = max(lower // 10 * 10 + 10, int(participants * 1.5 + 9) // 10 * 10)
+    return f"{lower}-{upper}"
+
+def build_sub_queries(city, participants, special_requirements=""):
+    """Build narrow sub-searches by venue type, district and capacity band"""
+    band = capacity_band(participants)
+    queries = [
+        {"facet": f"type:{venue_type}", "query": f"{venue_type} {city} for {participants} people"}
+        for venue_type in VENUE_TYPES
+    ]
+    queries += [
+        {"facet": f"district:{district}", "query": f"event venue {district} {city}"}
+        for district in DISTRICTS
+    ]
+    queries.append({"facet": f"capacity:{band}", "query": f"event venue {city} capacity {band} guests"})
+    if requirement_keywords(special_requirements):
+        queries.append({
+            "facet": "requirements",
+            "query": f"event venue {city} {special_requirements}"
+        })
+    return queries
+
+def requirement_keywords(special_requirements):
+    """Extract the meaningful words of the special requirements"""
+    words = re.findall(r"[a-zA-Z]{4,}", str(special_requirements).lower())
+    return [word for word in words if word not in STOPWORDS]
+
+def _candidate_key(item):
+    domain = urlparse(item.get("link", "")).netloc.lower()
+    if domain.startswith("www."):
+        domain = domain[4:]
+    title = re.sub(r"[^a-z0-9]+", " ", item.get("title", "").lower()).strip()
+    return f"{domain}|{title[:40]}"
+
+def merge_candidates(results):
+    """Merge organic results from all sub-searches, counting how many facets found each"""
+    candidates = {}
+    for facet, organic in results:
+        for item in organic:
+            if not item.get("link"):
+                continue
+            key = _candidate_key(item)
+            candidate = candidates.setdefault(key, {
+                "name": item.get("title", ""),
+                "link": item["link"],
+                "snippet": item.get("snippet", ""),
+                "facets": [],
+            })
+            if facet not in candidate["facets"]:
+                candidate["facets"].append(facet)
+    return list(candidates.values())
+
+def _extract_capacity(text):
+    values = [int(a or b) for a, b in CAPACITY_PATTERN.findall(text)]
+    return max(values) if values else None
+
+def _extract_price(text):
+    values = [int(value.replace(",", "")) for value in PRICE_PATTERN.findall(text) if value.replace(",", "")]
+    return min(values) if values else None
+
+def score_candidate(candidate, participants, budget_amount, keywords, facet_count):
+    """Score a candidate between 0 and 1 against capacity, budget and requirements"""
+    text = f"{candidate['name']} {candidate['snippet']}"
+    capacity = _extract_capacity(text)
+    price = _extract_price(text)
+
+    if capacity is None:
+        capacity_score = 0.5
+    elif capacity < participants:
+        capacity_score = 0.0
+    else:
+        # Prefer venues that fit without being far too large
+        capacity_score = max(0.2, 1 - (capacity - participants) / (participants * 3))
+
+    if price is None or not budget_amount:
+        budget_score = 0.5
+    elif price <= budget_amount:
+        budget_score = 1.0
+    else:
+        budget_score = max(0.0, 1 - (price - budget_amount) / budget_amount)
+
+    if keywords:
+        lowered = text.lower()
+        requirements_score = sum(1 for keyword in keywords if keyword in lowered) / len(keywords)
+        weights = SCORE_WEIGHTS
+    else:
+        requirements_score = 0.0
+        # Without requirements, spread their weight over the other criteria
+        scale = 1 / (1 - SCORE_WEIGHTS["requirements"])
+        weights = {name: weight * scale for name, weight in SCORE_WEIGHTS.items()}
+        weights["requirements"] = 0.0
+
+    corroboration_score = min(1.0, (len(candidate["facets"]) - 1) / max(1, facet_count - 1) * 3)
+
+    score = (
+        weights["capacity"] * capacity_score
+        + weights["budget"] * budget_score
+        + weights["requirements"] * requirements_score
+        + weights["corroboration"] * corroboration_score
+    )
+    return {
+        **candidate,
+        "estimated_capacity": capacity,
+        "estimated_price": price,
+        "score": round(score, 3),
+    }
+
+def rank_candidates(candidates, participants, budget, special_requirements, facet_count):
+    """Score and sort merged candidates, best first"""
+    budget_amount = parse_budget(budget)
+    keywords = requirement_keywords(special_requirements)
+    scored = [
+        score_candidate(candidate, participants, budget_amount, keywords, facet_count)
+        for candidate in candidates
+    ]
+    return sorted(scored, key=lambda candidate: candidate["score"], reverse=True)
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from pydantic import BaseModel, Field
+from typing import Type
+from config import (
+    SERPER_API_KEY,
+    VENUE_FANOUT_MAX_WORKERS,
+    VENUE_SUBSEARCH_TIMEOUT,
+    VENUE_CANDIDATES_RETURNED,
+)
+from tools import BaseTool
+from venue_ranking import build_sub_queries, merge_candidates, rank_candidates
+from web import serper_search, prefetch_pages
+import contextvars
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def run_sub_searches(sub_queries, api_key=SERPER_API_KEY, timeout=VENUE_SUBSEARCH_TIMEOUT):
+    """Run sub-searches concurrently, keeping only those that finish within the timeout"""
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(VENUE_FANOUT_MAX_WORKERS, len(sub_queries))),
+        thread_name_prefix="venue-search"
+    )
+    # Each sub-search runs in its own copy of the caller's context to keep log tagging
+    futures = {
+        executor.submit(contextvars.copy_context().run, serper_search, [sub_query["query"]], api_key, 10, timeout): sub_query
+        for sub_query in sub_queries
+    }
+    done, not_done = wait(futures, timeout=timeout)
+    for future in not_done:
+        future.cancel()
+    executor.shutdown(wait=False)
+
+    results = []
+    for future in done:
+        facet = futures[future]["facet"]
+        try:
+            results.append((facet, future.result()[0].get("organic", [])))
+        except Exception as e:
+            logger.warning(f"Venue sub-search '{facet}' failed: {e}")
+    if not_done:
+        logger.info(f"{len(not_done)} venue sub-search(es) exceeded {timeout}s and were dropped")
+    return results
+
+def search_venues(city, participants, budget, special_requirements="", api_key=SERPER_API_KEY):
+    """Fan out venue sub-searches and return ranked candidates"""
+    started = time.perf_counter()
+    sub_queries = build_sub_queries(city, participants, special_requirements)
+    results = run_sub_searches(sub_queries, api_key)
+    candidates = merge_candidates(results)
+    ranked = rank_candidates(candidates, participants, budget, special_requirements, len(results))
+    logger.info(
+        f"Venue fan-out: {len(results)}/{len(sub_queries)} sub-searches, "
+        f"{len(candidates)} candidates in {time.perf_counter() - started:.1f}s"
+    )
+    return ranked
+
+class VenueSearchSchema(BaseModel):
+    """Input for VenueSearchTool"""
+    city: str = Field(..., description="City where the event takes place")
+    expected_participants: int = Field(..., description="Expected number of participants")
+    budget: str = Field("", description="Event budget, e.g. '$5000'")
+    special_requirements: str = Field("", description="Special requirements for the venue")
+
+class VenueSearchTool(BaseTool):
+    """Searches venues by type, district and capacity in parallel and ranks them locally"""
+    name: str = "Search and rank venues"
+    description: str = (
+        "Search many venue types and districts of a city in parallel and return the candidates "
+        "ranked by fit for capacity, budget and special requirements, with links for follow-up scraping."
+    )
+    args_schema: Type[BaseModel] = VenueSearchSchema
+    api_key: str = ""
+
+    def _run(self, city: str = "", expected_participants: int = 0, budget: str = "",
+             special_requirements: str = "", **kwargs):
+        if not city or not expected_participants:
+            return "City and expected_participants are required."
+
+        ranked = search_venues(city, int(expected_participants), budget, special_requirements, self.api_key)
+        top = ranked[:VENUE_CANDIDATES_RETURNED]
+        if not top:
+            return "No venue candidates found."
+
+        # The agent will usually verify the best candidates next
+        prefetch_pages([candidate["link"] for candidate in top[:2]])
+        return json.dumps(top, indent=2)
+
+def create_venue_search_tool():
+    """Create the parallel venue search tool, or None without a Serper API key"""
+    if not SERPER_API_KEY:
+        logger.warning("SERPER_API_KEY not found, parallel venue search disabled")
+        return None
+    return VenueSearchTool(api_key=SERPER_API_KEY)
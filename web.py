@@ -0,0 +1,189 @@
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    SERPER_API_KEY,
+    SEARCH_BATCH_MAX_QUERIES,
+    PREFETCH_TOP_K,
+    PREFETCH_MAX_WORKERS,
+    SCRAPE_CACHE_TTL,
+    SCRAPE_CACHE_MAX_ENTRIES,
+    shutdown_event,
+)
+from http_client import get_session
+import contextvars
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+SCRAPE_TIMEOUT = 30
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Scrape cache shared by the scrape tool and the background prefetcher
+_scrape_cache = {}  # url -> (timestamp, content)
+_scrape_inflight = {}  # url -> Future for pages currently being prefetched
+_scrape_cache_lock = threading.Lock()
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=max(1, PREFETCH_MAX_WORKERS),
+    thread_name_prefix="scrape-prefetch"
+)
+
+def get_cached_page(url):
+    """Return cached page content for a URL, or None if missing or expired"""
+    with _scrape_cache_lock:
+        entry = _scrape_cache.get(url)
+        if entry is None:
+            return None
+        cached_at, content = entry
+        if time.time() - cached_at > SCRAPE_CACHE_TTL:
+            del _scrape_cache[url]
+            return None
+        return content
+
+def store_cached_page(url, content):
+    """Store page content in the scrape cache, evicting the oldest entry when full"""
+    with _scrape_cache_lock:
+        if url not in _scrape_cache and len(_scrape_cache) >= SCRAPE_CACHE_MAX_ENTRIES:
+            oldest_url = min(_scrape_cache, key=lambda key: _scrape_cache[key][0])
+            del _scrape_cache[oldest_url]
+        _scrape_cache[url] = (time.time(), content)
+
+def fetch_page_text(url, headers=None, cookies=None):
+    """Download a page over the shared keep-alive session
+
+    Returns (ok, visible text); ok is False for error statuses.
+    """
+    page = get_session().get(
+        url,
+        timeout=SCRAPE_TIMEOUT,
+        headers=headers or SCRAPE_HEADERS,
+        cookies=cookies or {}
+    )
+    page.encoding = page.apparent_encoding
+    text = BeautifulSoup(page.text, "html.parser").get_text(" ")
+    text = re.sub('[ \t]+', ' ', text)
+    return page.ok, re.sub('\\s+\n\\s+', '\n', text)
+
+def scrape_page(url, headers=None, cookies=None):
+    """Return a page's text from the cache, an in-flight prefetch or the network
+
+    Error pages are returned but never cached, so the next scrape retries them.
+    """
+    cached = get_cached_page(url)
+    if cached is not None:
+        logger.info(f"Scrape cache hit: {url}")
+        return cached
+
+    # Wait for an in-flight prefetch instead of fetching the same page twice
+    with _scrape_cache_lock:
+        pending = _scrape_inflight.get(url)
+    if pending is not None:
+        try:
+            pending.result(timeout=SCRAPE_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Prefetch of {url} failed: {e}")
+        cached = get_cached_page(url)
+        if cached is not None:
+            logger.info(f"Scrape cache hit after prefetch: {url}")
+            return cached
+
+    ok, content = fetch_page_text(url, headers=headers, cookies=cookies)
+    if ok and content:
+        store_cached_page(url, content)
+    elif not ok:
+        logger.info(f"Not caching error page for {url}")
+    return content
+
+def _prefetch_page(url):
+    """Fetch a single page into the scrape cache (runs on the prefetch pool)"""
+    try:
+        if shutdown_event.is_set() or get_cached_page(url) is not None:
+            return
+        ok, content = fetch_page_text(url)
+        if ok and content:
+            store_cached_page(url, content)
+            logger.debug(f"Prefetched {url}")
+        elif not ok:
+            logger.debug(f"Prefetch of {url} returned an error status, not cached")
+    except Exception as e:
+        logger.debug(f"Prefetch failed for {url}: {e}")
+    finally:
+        with _scrape_cache_lock:
+            _scrape_inflight.pop(url, None)
+
+def prefetch_pages(urls):
+    """Schedule background prefetching of URLs into the scrape cache"""
+    if shutdown_event.is_set():
+        return
+    for url in urls:
+        if get_cached_page(url) is not None:
+            continue
+        with _scrape_cache_lock:
+            if url in _scrape_inflight:
+                continue
+            try:
+                # Run in a copy of the caller's context so log records keep its run_id and agent_role
+                _scrape_inflight[url] = _prefetch_executor.submit(contextvars.copy_context().run, _prefetch_page, url)
+            except RuntimeError:
+                # Executor already shut down during interpreter exit
+                return
+
+def serper_search(queries, api_key=SERPER_API_KEY, n_results=5, timeout=30):
+    """Send all queries to Serper as a single batch request and return one result per query"""
+    payload = [{"q": query, "num": n_results} for query in queries]
+    headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
+    response = get_session().post(SERPER_SEARCH_URL, headers=headers, data=json.dumps(payload), timeout=timeout)
+    response.raise_for_status()
+    results = response.json()
+    # Serper answers a single-element batch with a list as well, but be lenient
+    return results if isinstance(results, list) else [results]
+
+def batch_search(search_query, api_key=SERPER_API_KEY, n_results=5, prefetch_top_k=PREFETCH_TOP_K):
+    """Run ';'-separated queries as one Serper batch and format the results for an agent
+
+    Queries over SEARCH_BATCH_MAX_QUERIES, or without a result in the response,
+    are listed at the end so the agent knows to search for them again.
+    """
+    queries = [query.strip() for query in search_query.split(';') if query.strip()]
+    if not queries:
+        return "No search query provided."
+    batch, skipped = queries[:SEARCH_BATCH_MAX_QUERIES], queries[SEARCH_BATCH_MAX_QUERIES:]
+
+    results = serper_search(batch, api_key, n_results)
+    missing = batch[len(results):]
+
+    sections = []
+    prefetch_urls = []
+    for query, result in zip(batch, results):
+        organic = result.get('organic', [])[:n_results]
+        lines = [f"Search results for: {query}"]
+        for item in organic:
+            lines.append(
+                f"Title: {item.get('title', '')}\n"
+                f"Link: {item.get('link', '')}\n"
+                f"Snippet: {item.get('snippet', '')}\n---"
+            )
+        sections.append("\n".join(lines))
+        prefetch_urls.extend(item['link'] for item in organic[:prefetch_top_k] if item.get('link'))
+
+    if skipped:
+        sections.append(
+            f"Not searched (at most {SEARCH_BATCH_MAX_QUERIES} queries per call, send these again): "
+            + "; ".join(skipped)
+        )
+    if missing:
+        logger.warning(f"Serper returned {len(results)} results for {len(batch)} queries")
+        sections.append("No results returned for: " + "; ".join(missing))
+
+    if prefetch_urls:
+        prefetch_pages(prefetch_urls)
+
+    return "\n\n".join(sections)